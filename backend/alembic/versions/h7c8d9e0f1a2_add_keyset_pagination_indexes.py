@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: h7c8d9e0f1a2
+Revises: g6b7c8d9e0f1
+Create Date: 2026-03-02 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'h7c8d9e0f1a2'
+down_revision: Union[str, None] = 'g6b7c8d9e0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes matching ORDER BY (created_at|uploaded_at) DESC, id DESC
+    op.create_index(
+        'ix_guests_wedding_id_created_at_id',
+        'guests',
+        ['wedding_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_media_uploads_wedding_id_uploaded_at_id',
+        'media_uploads',
+        ['wedding_id', 'uploaded_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_media_uploads_wedding_id_uploaded_at_id', table_name='media_uploads')
+    op.drop_index('ix_guests_wedding_id_created_at_id', table_name='guests')
@@ -0,0 +1,47 @@
+"""add foreign key and filter indexes
+
+Revision ID: i8d9e0f1a2b3
+Revises: h7c8d9e0f1a2
+Create Date: 2026-03-03 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'i8d9e0f1a2b3'
+down_revision: Union[str, None] = 'h7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) - shaped after the WHERE/ORDER BY clauses in
+# routers/ and services/. guest_id lookups on travel_infos, hotel_infos,
+# guest_food_preferences, guest_activities and guest_dress_preferences are
+# already served by their unique constraints.
+INDEXES = [
+    ('ix_guests_wedding_id_rsvp_status', 'guests', ['wedding_id', 'rsvp_status']),
+    ('ix_guests_wedding_id_last_accessed_at', 'guests', ['wedding_id', 'last_accessed_at']),
+    ('ix_guest_activities_activity_id', 'guest_activities', ['activity_id', 'number_of_participants']),
+    ('ix_guest_dress_preferences_dress_code_id', 'guest_dress_preferences', ['dress_code_id']),
+    ('ix_activities_wedding_id_display_order', 'activities', ['wedding_id', 'display_order', 'date_time']),
+    ('ix_media_uploads_wedding_id_is_approved_uploaded_at', 'media_uploads', ['wedding_id', 'is_approved', 'uploaded_at']),
+    ('ix_media_uploads_guest_id_uploaded_at', 'media_uploads', ['guest_id', 'uploaded_at']),
+    ('ix_invitations_event_id_is_sent', 'invitations', ['event_id', 'is_sent']),
+    ('ix_invitations_guest_id_event_id', 'invitations', ['guest_id', 'event_id']),
+    ('ix_suggested_hotels_wedding_id_display_order', 'suggested_hotels', ['wedding_id', 'display_order']),
+    ('ix_dress_codes_wedding_id_display_order', 'dress_codes', ['wedding_id', 'display_order', 'event_date']),
+    ('ix_food_menus_wedding_id', 'food_menus', ['wedding_id']),
+    ('ix_hotel_infos_suggested_hotel_id', 'hotel_infos', ['suggested_hotel_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""add activity reserved participants counter
+
+Revision ID: j9e0f1a2b3c4
+Revises: i8d9e0f1a2b3
+Create Date: 2026-03-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'j9e0f1a2b3c4'
+down_revision: Union[str, None] = 'i8d9e0f1a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'activities',
+        sa.Column('reserved_participants', sa.Integer(), nullable=False, server_default='0')
+    )
+    # Backfill from existing registrations; the (guest_id, activity_id)
+    # uniqueness the counter relies on is uq_guest_activity.
+    op.execute("""
+        UPDATE activities a
+        SET reserved_participants = s.total
+        FROM (
+            SELECT activity_id, SUM(number_of_participants) AS total
+            FROM guest_activities
+            GROUP BY activity_id
+        ) s
+        WHERE a.id = s.activity_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('activities', 'reserved_participants')
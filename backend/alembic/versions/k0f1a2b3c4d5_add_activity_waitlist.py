@@ -0,0 +1,43 @@
+"""add activity waitlist
+
+Revision ID: k0f1a2b3c4d5
+Revises: j9e0f1a2b3c4
+Create Date: 2026-03-12 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'k0f1a2b3c4d5'
+down_revision: Union[str, None] = 'j9e0f1a2b3c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('activity_waitlist',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('activity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('guest_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('number_of_participants', sa.Integer(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['activity_id'], ['activities.id'], name=op.f('fk_activity_waitlist_activity_id_activities'), ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['guest_id'], ['guests.id'], name=op.f('fk_activity_waitlist_guest_id_guests'), ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_activity_waitlist')),
+        sa.UniqueConstraint('activity_id', 'guest_id', name='uq_activity_waitlist_guest')
+    )
+    op.create_index(
+        'ix_activity_waitlist_activity_id_enqueued_at',
+        'activity_waitlist',
+        ['activity_id', 'enqueued_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activity_waitlist_activity_id_enqueued_at', table_name='activity_waitlist')
+    op.drop_table('activity_waitlist')
@@ -0,0 +1,36 @@
+"""case-insensitive unique invitation codes
+
+Revision ID: m2b3c4d5e6f7
+Revises: l1a2b3c4d5e6
+Create Date: 2026-03-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'm2b3c4d5e6f7'
+down_revision: Union[str, None] = 'l1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE invitations SET invitation_code = upper(invitation_code) "
+        "WHERE invitation_code <> upper(invitation_code)"
+    )
+    op.create_index(
+        'uq_invitations_invitation_code_upper',
+        'invitations',
+        [sa.text('upper(invitation_code)')],
+        unique=True
+    )
+    op.drop_constraint(op.f('uq_invitations_invitation_code'), 'invitations', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint(op.f('uq_invitations_invitation_code'), 'invitations', ['invitation_code'])
+    op.drop_index('uq_invitations_invitation_code_upper', table_name='invitations')
@@ -0,0 +1,37 @@
+"""one invitation per guest and event
+
+Revision ID: n3c4d5e6f7a8
+Revises: m2b3c4d5e6f7
+Create Date: 2026-03-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'n3c4d5e6f7a8'
+down_revision: Union[str, None] = 'm2b3c4d5e6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the earliest invitation for each guest/event pair
+    op.execute(
+        "DELETE FROM invitations a USING invitations b "
+        "WHERE a.guest_id = b.guest_id AND a.event_id = b.event_id "
+        "AND (a.created_at, a.id) > (b.created_at, b.id)"
+    )
+    op.drop_index('ix_invitations_guest_id_event_id', table_name='invitations')
+    op.create_unique_constraint(
+        'uq_invitations_guest_id_event_id',
+        'invitations',
+        ['guest_id', 'event_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_invitations_guest_id_event_id', 'invitations', type_='unique')
+    op.create_index('ix_invitations_guest_id_event_id', 'invitations', ['guest_id', 'event_id'], unique=False)
@@ -4,22 +4,88 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine
 )
-from typing import AsyncGenerator
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from typing import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+import logging
+import os
 
 from app.config import settings
 from app.models.base import Base
+from app.utils.metrics import instrument_pool
+from app.utils.query_stats import instrument_engine
+from app.utils.tracing import instrument_engine_tracing
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Arbitrary app-wide key for pg_advisory_lock around startup migrations
+MIGRATION_LOCK_KEY = 7_271_001
+
+
+def _pool_limits() -> tuple[int, int]:
+    """
+    Pool size and overflow for this worker. With DB_CONNECTION_BUDGET set,
+    the budget is split evenly across WEB_CONCURRENCY workers so the whole
+    deployment never opens more connections than the database allows.
+    """
+    if not settings.DB_CONNECTION_BUDGET:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    per_worker = max(1, settings.DB_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY))
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    return pool_size, per_worker - pool_size
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine using the pool and connection settings."""
+    pool_size, max_overflow = _pool_limits()
+    server_settings = {"application_name": settings.APP_NAME}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO and settings.ENVIRONMENT != "production",
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={
+            # asyncpg's own cache and SQLAlchemy's adapter cache
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        }
+    )
+    instrument_engine(new_engine)
+    if settings.TRACING_ENABLED:
+        instrument_engine_tracing(new_engine)
+    return new_engine
 
 
 # Create async engine
-engine: AsyncEngine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+engine: AsyncEngine = _create_engine(settings.DATABASE_URL)
+
+# Read-only endpoints use the replica when one is configured
+read_engine: AsyncEngine = (
+    _create_engine(settings.DATABASE_READ_REPLICA_URL)
+    if settings.DATABASE_READ_REPLICA_URL
+    else engine
 )
 
+instrument_pool(engine, "primary")
+if read_engine is not engine:
+    instrument_pool(read_engine, "replica")
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -29,16 +95,89 @@ async_session_maker = async_sessionmaker(
     autoflush=False
 )
 
+# Read sessions run in autocommit: no BEGIN/COMMIT round trips and no
+# transaction held open while the handler awaits other work.
+read_session_maker = async_sessionmaker(
+    read_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
+
+_HAS_WRITES = "has_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context) -> None:
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state) -> None:
+    # Core update()/delete()/insert() and raw SQL bypass the flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """True if the session flushed, executed or still holds any changes."""
+    return bool(
+        session.new or session.dirty or session.deleted
+        or session.sync_session.info.get(_HAS_WRITES)
+    )
+
+
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Call ``callback`` once the session's transaction commits; dropped on
+    rollback. For invalidating process caches, which must not be refilled
+    from the database before the change is visible.
+    """
+    session.sync_session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_commit_callbacks(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+async def _commit_if_written(session: AsyncSession) -> None:
+    if has_pending_writes(session):
+        await session.commit()
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    End the session's transaction so its connection returns to the pool
+    before a long await on an external service (e.g. the LLM). Changes made
+    so far are committed; loaded objects remain usable and the session
+    checks out a new connection on its next query.
+    """
+    if session.in_transaction():
+        await session.commit()
+    session.sync_session.info.pop(_HAS_WRITES, None)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency that yields database sessions.
-    Use with FastAPI's Depends().
+    Dependency that yields read-write database sessions.
+    Use with FastAPI's Depends(). Commits only if the request wrote anything.
     """
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            await _commit_if_written(session)
         except Exception:
             await session.rollback()
             raise
@@ -46,6 +185,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only endpoints; routed to the read replica when
+    DATABASE_READ_REPLICA_URL is set. Runs in autocommit and must not be
+    used for writes.
+    """
+    async with read_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 @asynccontextmanager
 async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -63,12 +215,96 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def _alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+async def _applied_revisions(conn: AsyncConnection) -> set[str]:
+    """Revisions recorded in alembic_version; empty if Alembic never ran."""
+    exists = await conn.scalar(text("SELECT to_regclass('alembic_version') IS NOT NULL"))
+    if not exists:
+        return set()
+    result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+    return set(result.scalars())
+
+
+def _upgrade_to_head(connection: Connection, config: Config) -> None:
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
 async def init_db() -> None:
-    """Initialize database tables."""
-    async with engine.begin() as conn:
+    """
+    Prepare the schema at startup according to DB_SCHEMA_MODE.
+
+    Both modes hold an advisory lock, so when many workers boot at once one
+    prepares the schema and the rest wait, then see head.
+    "migrate" upgrades to head. "auto" creates the tables on an empty
+    database and stamps head; it refuses to start on a database that Alembic
+    has not brought to head, since create_all cannot add columns or
+    constraints to existing tables.
+    """
+    if settings.DB_SCHEMA_MODE == "off":
+        return
+
+    config = _alembic_config()
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+
+    async with engine.connect() as conn:
+        # Waiting for another worker's migration, and the migration itself,
+        # must not be cut off by DB_STATEMENT_TIMEOUT_MS; RESET below puts
+        # the connection back to the pool default
+        await conn.execute(text("SET statement_timeout = 0"))
+        await conn.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        try:
+            await _prepare_schema(conn, config, heads)
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            await conn.execute(text("RESET statement_timeout"))
+            await conn.commit()
+
+
+def _stamp_head(connection: Connection, config: Config) -> None:
+    config.attributes["connection"] = connection
+    command.stamp(config, "head")
+
+
+def _has_app_tables(connection: Connection) -> bool:
+    existing = set(inspect(connection).get_table_names())
+    return any(table in existing for table in Base.metadata.tables)
+
+
+async def _prepare_schema(conn: AsyncConnection, config: Config, heads: set[str]) -> None:
+    applied = await _applied_revisions(conn)
+    if applied == heads:
+        return
+
+    if settings.DB_SCHEMA_MODE == "migrate":
+        logger.info("Running database migrations to %s", ", ".join(sorted(heads)))
+        await conn.run_sync(_upgrade_to_head, config)
+    elif not applied and not await conn.run_sync(_has_app_tables):
+        logger.info("Creating database schema at %s", ", ".join(sorted(heads)))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_stamp_head, config)
+    else:
+        raise RuntimeError(
+            "Database schema is behind the latest migration; run "
+            "'alembic upgrade head' or start with DB_SCHEMA_MODE=migrate"
+        )
 
 
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
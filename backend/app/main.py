@@ -2,14 +2,13 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from datetime import datetime
 import os
 import sys
 import logging
-import traceback
 
 # Fix for Windows asyncio + asyncpg
 if sys.platform == 'win32':
@@ -18,6 +17,13 @@ if sys.platform == 'win32':
 
 from app.config import settings
 from app.database import init_db, close_db
+from app.utils.auth import shutdown_password_executor
+from app.utils.log_config import configure_logging, shutdown_logging
+from app.utils.metrics import MetricsMiddleware, render_metrics
+from app.utils.query_budget import QueryBudgetMiddleware
+from app.utils.idempotency import IdempotencyMiddleware
+from app.utils.rate_limit import RateLimitMiddleware, close_rate_limiter
+from app.utils.tracing import LoopLagMonitor, TracingMiddleware, shutdown_tracing
 from app.utils.exceptions import (
     AppException,
     create_error_response,
@@ -30,10 +36,7 @@ from app.utils.exceptions import (
 )
 
 # Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if settings.DEBUG else logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 # Import all models to register them with Base.metadata
 from app.models import (
@@ -79,11 +82,22 @@ async def lifespan(app: FastAPI):
     os.makedirs(os.path.join(settings.UPLOAD_DIR, "activities"), exist_ok=True)
     logger.info(f"Upload directory ready: {settings.UPLOAD_DIR}")
 
+    lag_monitor = None
+    if settings.LOOP_LAG_MONITOR_ENABLED:
+        lag_monitor = LoopLagMonitor(settings.LOOP_LAG_THRESHOLD_MS)
+        lag_monitor.start()
+
     yield
 
     # Shutdown
+    if lag_monitor:
+        await lag_monitor.stop()
     await close_db()
     logger.info("Database connections closed")
+    await close_rate_limiter()
+    shutdown_password_executor()
+    shutdown_tracing()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -94,6 +108,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Inside CORS so that 409/422/429 responses still carry CORS headers
+app.add_middleware(IdempotencyMiddleware, ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -107,6 +127,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        default_budget=settings.QUERY_BUDGET_DEFAULT,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+        raise_on_violation=settings.QUERY_BUDGET_MODE == "raise"
+    )
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if settings.TRACING_ENABLED:
+    app.add_middleware(
+        TracingMiddleware,
+        sample_rate=settings.TRACE_SAMPLE_RATE,
+        slow_request_ms=settings.TRACE_SLOW_REQUEST_MS
+    )
+
 # Mount static files for uploads
 if os.path.exists(settings.UPLOAD_DIR):
     app.mount(
@@ -124,7 +162,7 @@ if os.path.exists(settings.UPLOAD_DIR):
 async def app_exception_handler(request: Request, exc: AppException):
     """Handle custom application exceptions."""
     logger.warning(
-        f"AppException: {exc.error_code} - {exc.detail} - Path: {request.url.path}"
+        "AppException: %s - %s - Path: %s", exc.error_code, exc.detail, request.url.path
     )
     return JSONResponse(
         status_code=exc.status_code,
@@ -153,7 +191,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     }
 
     logger.warning(
-        f"HTTPException: {exc.status_code} - {exc.detail} - Path: {request.url.path}"
+        "HTTPException: %s - %s - Path: %s", exc.status_code, exc.detail, request.url.path
     )
 
     return JSONResponse(
@@ -173,9 +211,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         field = ".".join(str(loc) for loc in error["loc"] if loc != "body")
         errors[field] = error["msg"]
 
-    logger.warning(
-        f"ValidationError: {errors} - Path: {request.url.path}"
-    )
+    logger.warning("ValidationError: %s - Path: %s", errors, request.url.path)
 
     return JSONResponse(
         status_code=422,
@@ -190,10 +226,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
-    # Log the full traceback for debugging
+    # The traceback is formatted on the logging thread, not here
     logger.error(
-        f"Unhandled exception: {str(exc)} - Path: {request.url.path}\n"
-        f"Traceback: {traceback.format_exc()}"
+        "Unhandled exception: %s - Path: %s", exc, request.url.path, exc_info=exc
     )
 
     # In production, don't expose internal error details
@@ -252,6 +287,14 @@ async def health_check():
     )
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint."""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -10,11 +10,13 @@ from app.models.food_menu import FoodMenu
 from app.models.guest_food_preference import GuestFoodPreference, MealSizePreference
 from app.models.activity import Activity
 from app.models.guest_activity import GuestActivity
+from app.models.activity_waitlist import ActivityWaitlist
 from app.models.media_upload import MediaUpload, FileType
 from app.models.event import Event
 from app.models.invitation import Invitation
 from app.models.chatbot_settings import ChatbotSettings
 from app.models.chatbot_log import ChatbotLog
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "Base",
@@ -32,10 +34,12 @@ __all__ = [
     "MealSizePreference",
     "Activity",
     "GuestActivity",
+    "ActivityWaitlist",
     "MediaUpload",
     "FileType",
     "Event",
     "Invitation",
     "ChatbotSettings",
     "ChatbotLog",
+    "IdempotencyKey",
 ]
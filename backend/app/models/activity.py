@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, DateTime, Integer, Boolean, Float, ForeignKey
+from sqlalchemy import String, Text, DateTime, Integer, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from datetime import datetime
@@ -9,6 +9,9 @@ from app.models.base import Base
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index('ix_activities_wedding_id_display_order', 'wedding_id', 'display_order', 'date_time'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -27,6 +30,11 @@ class Activity(Base):
     duration_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     location: Mapped[str | None] = mapped_column(String(300), nullable=True)
     max_participants: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Sum of number_of_participants over guest_activities, kept in step by
+    # app.services.activity_service so capacity checks never rescan
+    reserved_participants: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     is_optional: Mapped[bool] = mapped_column(Boolean, default=True)
     requires_signup: Mapped[bool] = mapped_column(Boolean, default=True)
     image_url: Mapped[str | None] = mapped_column(String, nullable=True)
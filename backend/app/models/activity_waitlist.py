@@ -0,0 +1,40 @@
+from sqlalchemy import Text, DateTime, Integer, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.models.base import Base
+
+
+class ActivityWaitlist(Base):
+    """A guest queued for a full activity, promoted first-in first-out."""
+    __tablename__ = "activity_waitlist"
+    __table_args__ = (
+        UniqueConstraint('activity_id', 'guest_id', name='uq_activity_waitlist_guest'),
+        # Promotion reads each activity's queue in enqueue order
+        Index('ix_activity_waitlist_activity_id_enqueued_at', 'activity_id', 'enqueued_at'),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    activity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    guest_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("guests.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    number_of_participants: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, DateTime, Integer, ForeignKey
+from sqlalchemy import String, Text, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from datetime import datetime
@@ -9,6 +9,9 @@ from app.models.base import Base
 
 class DressCode(Base):
     __tablename__ = "dress_codes"
+    __table_args__ = (
+        Index('ix_dress_codes_wedding_id_display_order', 'wedding_id', 'display_order', 'event_date'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, ForeignKey
+from sqlalchemy import String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSON
 import uuid
@@ -8,6 +8,9 @@ from app.models.base import Base
 
 class FoodMenu(Base):
     __tablename__ = "food_menus"
+    __table_args__ = (
+        Index('ix_food_menus_wedding_id', 'wedding_id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Index, Enum as SQLEnum, JSON
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -17,6 +17,13 @@ class RSVPStatus(str, enum.Enum):
 
 class Guest(Base, TimestampMixin):
     __tablename__ = "guests"
+    __table_args__ = (
+        # Keyset pagination of the admin guest list
+        Index('ix_guests_wedding_id_created_at_id', 'wedding_id', 'created_at', 'id'),
+        # RSVP counts on the dashboard and list filters
+        Index('ix_guests_wedding_id_rsvp_status', 'wedding_id', 'rsvp_status'),
+        Index('ix_guests_wedding_id_last_accessed_at', 'wedding_id', 'last_accessed_at'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
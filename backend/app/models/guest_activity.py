@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, DateTime, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Text, DateTime, Integer, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -11,6 +11,8 @@ class GuestActivity(Base):
     __tablename__ = "guest_activities"
     __table_args__ = (
         UniqueConstraint('guest_id', 'activity_id', name='uq_guest_activity'),
+        # Per-activity registration counts and participant sums
+        Index('ix_guest_activities_activity_id', 'activity_id', 'number_of_participants'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
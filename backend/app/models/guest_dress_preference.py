@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Text, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -10,6 +10,7 @@ class GuestDressPreference(Base):
     __tablename__ = "guest_dress_preferences"
     __table_args__ = (
         UniqueConstraint('guest_id', 'dress_code_id', name='uq_guest_dress_code'),
+        Index('ix_guest_dress_preferences_dress_code_id', 'dress_code_id'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
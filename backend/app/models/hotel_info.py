@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, Integer, Date, Boolean, ForeignKey
+from sqlalchemy import String, Text, Integer, Date, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import date
@@ -9,6 +9,9 @@ from app.models.base import Base
 
 class HotelInfo(Base):
     __tablename__ = "hotel_infos"
+    __table_args__ = (
+        Index('ix_hotel_infos_suggested_hotel_id', 'suggested_hotel_id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
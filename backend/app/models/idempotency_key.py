@@ -0,0 +1,36 @@
+from sqlalchemy import String, Integer, DateTime, LargeBinary, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID, JSON
+from datetime import datetime
+import uuid
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """A stored response for a client-supplied Idempotency-Key."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint('key', 'request_scope', name='uq_idempotency_keys_key_request_scope'),
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    # "<METHOD> <path>"; the path carries the guest token
+    request_scope: Mapped[str] = mapped_column(String(500), nullable=False)
+    request_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL while the first request is still running
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_headers: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    response_body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
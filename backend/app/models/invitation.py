@@ -1,15 +1,20 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 
 from app.models.base import Base
+from app.utils.helpers import generate_invitation_code
 
 
 class Invitation(Base):
     """Model for tracking invitations sent to guests for specific events."""
     __tablename__ = "invitations"
+    __table_args__ = (
+        Index('ix_invitations_event_id_is_sent', 'event_id', 'is_sent'),
+        UniqueConstraint('guest_id', 'event_id', name='uq_invitations_guest_id_event_id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -29,12 +34,12 @@ class Invitation(Base):
         nullable=False
     )
 
-    # Invitation Code (unique per invitation for RSVP tracking)
+    # Invitation Code (unique per invitation for RSVP tracking); stored in
+    # upper case and unique case-insensitively, see the index below
     invitation_code: Mapped[str] = mapped_column(
         String(50),
-        unique=True,
         nullable=False,
-        default=lambda: str(uuid.uuid4())[:8].upper()
+        default=generate_invitation_code
     )
 
     # Sending Status
@@ -79,6 +84,13 @@ class Invitation(Base):
     )
 
 
+Index(
+    'uq_invitations_invitation_code_upper',
+    func.upper(Invitation.invitation_code),
+    unique=True
+)
+
+
 # Import at the end to avoid circular imports
 from app.models.guest import Guest
 from app.models.event import Event
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, DateTime, BigInteger, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, DateTime, BigInteger, Boolean, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -15,6 +15,13 @@ class FileType(str, enum.Enum):
 
 class MediaUpload(Base):
     __tablename__ = "media_uploads"
+    __table_args__ = (
+        # Keyset pagination of the admin media gallery
+        Index('ix_media_uploads_wedding_id_uploaded_at_id', 'wedding_id', 'uploaded_at', 'id'),
+        # Approval counts and filtered gallery, guest's own uploads
+        Index('ix_media_uploads_wedding_id_is_approved_uploaded_at', 'wedding_id', 'is_approved', 'uploaded_at'),
+        Index('ix_media_uploads_guest_id_uploaded_at', 'guest_id', 'uploaded_at'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text, Integer, Boolean, ForeignKey
+from sqlalchemy import String, Text, Integer, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSON
 import uuid
@@ -8,6 +8,9 @@ from app.models.base import Base
 
 class SuggestedHotel(Base):
     __tablename__ = "suggested_hotels"
+    __table_args__ = (
+        Index('ix_suggested_hotels_wedding_id_display_order', 'wedding_id', 'display_order'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -3,14 +3,14 @@ import uuid as uuid_lib
 import aiofiles
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, delete as sa_delete
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
 from app.database import get_db
-from app.models import Wedding, Activity, GuestActivity, Guest
+from app.models import Activity, GuestActivity, Guest
 from app.schemas import (
     ActivityCreate,
     ActivityUpdate,
@@ -18,7 +18,9 @@ from app.schemas import (
     GuestActivityResponse,
     SuccessResponse
 )
-from app.utils.auth import get_current_wedding
+from app.services.activity_service import promote_waitlists
+from app.utils.auth import get_current_principal, WeddingPrincipal
+from app.utils.query_budget import query_budget
 from app.config import settings
 
 router = APIRouter(prefix="/api/admin/activities", tags=["Admin Activities"])
@@ -70,7 +72,7 @@ class GuestRegistration(BaseModel):
 @router.post("/upload-image")
 async def upload_activity_image(
     file: UploadFile = File(...),
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
 ):
     """Upload an activity image and return the URL."""
     allowed_types = ["image/jpeg", "image/png", "image/webp", "image/gif"]
@@ -97,7 +99,7 @@ async def upload_activity_image(
 @router.post("/", response_model=ActivityResponse, status_code=status.HTTP_201_CREATED)
 async def create_activity(
     data: ActivityCreate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create activity."""
@@ -153,33 +155,34 @@ async def create_activity(
 
 
 @router.get("/", response_model=List[ActivityWithCount])
+@query_budget(2)
 async def list_activities(
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """List all activities with registration counts."""
+    counts = (
+        select(
+            GuestActivity.activity_id,
+            func.count(GuestActivity.id).label("participant_count"),
+            func.sum(GuestActivity.number_of_participants).label("total_attendees")
+        )
+        .join(Activity, Activity.id == GuestActivity.activity_id)
+        .where(Activity.wedding_id == wedding.id)
+        .group_by(GuestActivity.activity_id)
+        .subquery()
+    )
     result = await db.execute(
-        select(Activity)
+        select(Activity, counts.c.participant_count, counts.c.total_attendees)
+        .outerjoin(counts, counts.c.activity_id == Activity.id)
         .where(Activity.wedding_id == wedding.id)
         .order_by(Activity.display_order, Activity.date_time)
     )
-    activities = result.scalars().all()
 
     activity_responses = []
-    for activity in activities:
-        # Get participant count
-        count_result = await db.execute(
-            select(func.count(GuestActivity.id))
-            .where(GuestActivity.activity_id == activity.id)
-        )
-        participant_count = count_result.scalar() or 0
-
-        # Get total attendees (sum of number_of_participants)
-        attendees_result = await db.execute(
-            select(func.sum(GuestActivity.number_of_participants))
-            .where(GuestActivity.activity_id == activity.id)
-        )
-        total_attendees = attendees_result.scalar() or 0
+    for activity, participant_count, total_attendees in result.all():
+        participant_count = participant_count or 0
+        total_attendees = total_attendees or 0
 
         dt_iso = activity.date_time.isoformat() if activity.date_time else None
         activity_responses.append(ActivityWithCount(
@@ -218,7 +221,8 @@ async def list_activities(
 async def update_activity(
     activity_id: UUID,
     data: ActivityUpdate,
-    wedding: Wedding = Depends(get_current_wedding),
+    background_tasks: BackgroundTasks,
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update activity."""
@@ -236,6 +240,7 @@ async def update_activity(
             detail="Activity not found"
         )
 
+    previous_capacity = activity.max_participants
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(activity, field, value)
@@ -243,6 +248,12 @@ async def update_activity(
     await db.flush()
     await db.refresh(activity)
 
+    # More seats (or no limit any more): let the waitlist in
+    if previous_capacity and (
+        not activity.max_participants or activity.max_participants > previous_capacity
+    ):
+        background_tasks.add_task(promote_waitlists, activity.id)
+
     # Get participant count
     count_result = await db.execute(
         select(func.count(GuestActivity.id))
@@ -278,7 +289,7 @@ async def update_activity(
 @router.delete("/{activity_id}", response_model=SuccessResponse)
 async def delete_activity(
     activity_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Remove activity."""
@@ -310,7 +321,7 @@ async def delete_activity(
 @router.get("/{activity_id}/registrations", response_model=List[GuestRegistration])
 async def list_activity_registrations(
     activity_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """List registered guests."""
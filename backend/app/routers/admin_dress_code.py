@@ -8,14 +8,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.database import get_db
-from app.models import Wedding, DressCode
+from app.models import DressCode
 from app.schemas import (
     DressCodeCreate,
     DressCodeUpdate,
     DressCodeResponse,
     SuccessResponse
 )
-from app.utils.auth import get_current_wedding
+from app.utils.auth import get_current_principal, WeddingPrincipal
 from app.config import settings
 
 router = APIRouter(prefix="/api/admin/dress-codes", tags=["Admin Dress Codes"])
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/api/admin/dress-codes", tags=["Admin Dress Codes"])
 @router.post("/", response_model=DressCodeResponse, status_code=status.HTTP_201_CREATED)
 async def create_dress_code(
     data: DressCodeCreate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create dress code for event."""
@@ -51,7 +51,7 @@ async def create_dress_code(
 
 @router.get("/", response_model=List[DressCodeResponse])
 async def list_dress_codes(
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """List all dress codes."""
@@ -69,7 +69,7 @@ async def list_dress_codes(
 async def update_dress_code(
     dress_code_id: UUID,
     data: DressCodeUpdate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update dress code."""
@@ -104,7 +104,7 @@ async def update_dress_code(
 @router.delete("/{dress_code_id}", response_model=SuccessResponse)
 async def delete_dress_code(
     dress_code_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Remove dress code."""
@@ -132,7 +132,7 @@ async def delete_dress_code(
 async def upload_dress_code_images(
     dress_code_id: UUID,
     files: List[UploadFile] = File(...),
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload dress code images."""
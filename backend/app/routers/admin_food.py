@@ -6,11 +6,9 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 
 from app.database import get_db
-from app.models import Wedding, FoodMenu, Guest, GuestFoodPreference
+from app.models import FoodMenu, Guest, GuestFoodPreference
 from app.schemas import (
     FoodMenuCreate,
     FoodMenuUpdate,
@@ -18,7 +16,7 @@ from app.schemas import (
     GuestFoodPreferenceResponse,
     SuccessResponse
 )
-from app.utils.auth import get_current_wedding
+from app.utils.auth import get_current_principal, WeddingPrincipal
 
 router = APIRouter(prefix="/api/admin/food-menu", tags=["Admin Food Menu"])
 
@@ -26,7 +24,7 @@ router = APIRouter(prefix="/api/admin/food-menu", tags=["Admin Food Menu"])
 @router.post("/", response_model=FoodMenuResponse, status_code=status.HTTP_201_CREATED)
 async def create_food_menu(
     data: FoodMenuCreate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create food menu for event."""
@@ -47,7 +45,7 @@ async def create_food_menu(
 
 @router.get("/", response_model=List[FoodMenuResponse])
 async def list_food_menus(
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """List all menus."""
@@ -63,7 +61,7 @@ async def list_food_menus(
 async def update_food_menu(
     menu_id: UUID,
     data: FoodMenuUpdate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update menu."""
@@ -94,7 +92,7 @@ async def update_food_menu(
 @router.delete("/{menu_id}", response_model=SuccessResponse)
 async def delete_food_menu(
     menu_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Remove menu."""
@@ -121,7 +119,7 @@ async def delete_food_menu(
 @router.get("/guest-preferences", response_model=List[GuestFoodPreferenceResponse])
 async def list_guest_food_preferences(
     export: bool = Query(default=False),
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """List all guest food preferences with export option."""
@@ -134,6 +132,9 @@ async def list_guest_food_preferences(
     preferences = result.scalars().all()
 
     if export:
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, PatternFill, Alignment
+
         wb = Workbook()
         ws = wb.active
         ws.title = "Food Preferences"
@@ -1,20 +1,18 @@
 import secrets
 import math
+from functools import partial
 from io import BytesIO
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, tuple_
 from sqlalchemy.orm import selectinload
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_after_commit
 from app.models import (
-    Wedding, Guest, TravelInfo, HotelInfo,
+    Guest, TravelInfo, HotelInfo,
     GuestFoodPreference, GuestDressPreference, GuestActivity, RSVPStatus
 )
 from app.models.dress_code import DressCode
@@ -22,7 +20,10 @@ from app.models.activity import Activity
 from app.schemas import (
     GuestCreate, GuestResponse, GuestListResponse, SuccessResponse
 )
-from app.utils.auth import get_current_wedding
+from app.services.activity_service import promote_waitlists, release_guest_reservations
+from app.services.guest_service import invalidate_guest_token
+from app.utils.auth import get_current_principal, WeddingPrincipal
+from app.utils.pagination import encode_cursor, decode_cursor, estimate_row_count
 from app.config import settings
 
 router = APIRouter(prefix="/api/admin/guests", tags=["Admin Guests"])
@@ -78,6 +79,9 @@ def generate_guest_link(unique_token: str) -> str:
 @router.get("/upload-template")
 async def download_upload_template():
     """Download an Excel template for bulk guest upload."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Guests"
@@ -120,10 +124,12 @@ async def download_upload_template():
 @router.post("/upload-excel", response_model=BulkUploadResponse)
 async def bulk_upload_guests(
     file: UploadFile = File(...),
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Bulk upload guests from Excel."""
+    import pandas as pd
+
     if not file.filename.endswith(('.xlsx', '.xls', '.csv')):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -233,29 +239,31 @@ async def bulk_upload_guests(
 async def list_guests(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     rsvp_status: Optional[str] = None,
     search: Optional[str] = None,
     activity_name: Optional[str] = None,
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db)
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all guests with pagination and filters."""
-    query = select(Guest).where(Guest.wedding_id == wedding.id)
-    count_query = select(func.count(Guest.id)).where(Guest.wedding_id == wedding.id)
+    """
+    List all guests with pagination and filters.
+    Pass the returned next_cursor back as cursor for constant-time deep pages;
+    include_total=false replaces the exact COUNT with a planner estimate.
+    """
+    filters = [Guest.wedding_id == wedding.id]
 
     # Apply filters
     if rsvp_status:
-        query = query.where(Guest.rsvp_status == RSVPStatus(rsvp_status))
-        count_query = count_query.where(Guest.rsvp_status == RSVPStatus(rsvp_status))
+        filters.append(Guest.rsvp_status == RSVPStatus(rsvp_status))
 
     if search:
-        search_filter = or_(
+        filters.append(or_(
             Guest.full_name.ilike(f"%{search}%"),
             Guest.email.ilike(f"%{search}%"),
             Guest.phone.ilike(f"%{search}%")
-        )
-        query = query.where(search_filter)
-        count_query = count_query.where(search_filter)
+        ))
 
     if activity_name:
         activity_subq = select(GuestActivity.guest_id).join(
@@ -264,19 +272,28 @@ async def list_guests(
             Activity.wedding_id == wedding.id,
             Activity.activity_name.ilike(f"%{activity_name}%")
         )
-        query = query.where(Guest.id.in_(activity_subq))
-        count_query = count_query.where(Guest.id.in_(activity_subq))
+        filters.append(Guest.id.in_(activity_subq))
 
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(Guest.created_at.desc())
+    if include_total:
+        total_result = await db.execute(select(func.count(Guest.id)).where(*filters))
+        total = total_result.scalar() or 0
+    else:
+        total = await estimate_row_count(db, select(Guest.id).where(*filters))
+
+    # Apply pagination (keyset when a cursor is given, offset otherwise)
+    query = select(Guest).where(*filters)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Guest.created_at, Guest.id) < (cursor_created_at, cursor_id))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.order_by(Guest.created_at.desc(), Guest.id.desc()).limit(page_size + 1)
 
     result = await db.execute(query)
     guests = result.scalars().all()
+    has_next = len(guests) > page_size
+    guests = guests[:page_size]
 
     # Check for travel and hotel info
     guest_ids = [g.id for g in guests]
@@ -320,15 +337,17 @@ async def list_guests(
         page=page,
         page_size=page_size,
         total_pages=total_pages,
-        has_next=page < total_pages,
-        has_previous=page > 1
+        has_next=has_next,
+        has_previous=page > 1 or cursor is not None,
+        next_cursor=encode_cursor(guests[-1].created_at, guests[-1].id) if has_next else None,
+        total_is_estimate=not include_total
     )
 
 
 @router.post("/", response_model=GuestResponse, status_code=status.HTTP_201_CREATED)
 async def create_guest(
     data: GuestCreate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Add single guest manually."""
@@ -352,10 +371,13 @@ async def create_guest(
 
 @router.get("/export")
 async def export_guests(
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db)
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export all guest data to Excel."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
     result = await db.execute(
         select(Guest)
         .options(
@@ -423,7 +445,7 @@ async def export_guests(
 @router.get("/{guest_id}")
 async def get_guest(
     guest_id: str,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get single guest details with all submitted data."""
@@ -569,7 +591,7 @@ async def get_guest(
 async def update_guest(
     guest_id: str,
     data: GuestUpdate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update guest information."""
@@ -600,7 +622,8 @@ async def update_guest(
 @router.delete("/{guest_id}", response_model=SuccessResponse)
 async def delete_guest(
     guest_id: str,
-    wedding: Wedding = Depends(get_current_wedding),
+    background_tasks: BackgroundTasks,
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a guest."""
@@ -615,8 +638,13 @@ async def delete_guest(
             detail="Guest not found"
         )
 
+    token = guest.unique_token
+    freed = await release_guest_reservations(guest.id, db)
     await db.delete(guest)
     await db.flush()
+    run_after_commit(db, partial(invalidate_guest_token, token))
+    if freed:
+        background_tasks.add_task(promote_waitlists, *freed)
 
     return SuccessResponse(message="Guest deleted successfully")
 
@@ -624,7 +652,7 @@ async def delete_guest(
 @router.post("/{guest_id}/regenerate-link", response_model=GuestWithFlags)
 async def regenerate_guest_link(
     guest_id: str,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Regenerate unique token/link for a guest."""
@@ -639,9 +667,11 @@ async def regenerate_guest_link(
             detail="Guest not found"
         )
 
+    old_token = guest.unique_token
     guest.unique_token = secrets.token_urlsafe(32)
     await db.flush()
     await db.refresh(guest)
+    run_after_commit(db, partial(invalidate_guest_token, old_token, guest.unique_token))
 
     name_parts = guest.full_name.split(' ', 1)
     return GuestWithFlags(
@@ -9,14 +9,14 @@ from sqlalchemy import select, update as sa_update
 from pydantic import BaseModel, model_validator
 
 from app.database import get_db
-from app.models import Wedding, SuggestedHotel, HotelInfo
+from app.models import SuggestedHotel, HotelInfo
 from app.schemas import (
     SuggestedHotelCreate,
     SuggestedHotelUpdate,
     SuggestedHotelResponse,
     SuccessResponse
 )
-from app.utils.auth import get_current_wedding
+from app.utils.auth import get_current_principal, WeddingPrincipal
 from app.config import settings
 
 router = APIRouter(prefix="/api/admin/hotels", tags=["Admin Hotels"])
@@ -48,7 +48,7 @@ class ReorderRequest(BaseModel):
 @router.post("/upload-image")
 async def upload_hotel_image(
     file: UploadFile = File(...),
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
 ):
     """Upload a hotel image and return the URL."""
     allowed_types = ["image/jpeg", "image/png", "image/webp", "image/gif"]
@@ -75,7 +75,7 @@ async def upload_hotel_image(
 @router.post("/", response_model=SuggestedHotelResponse, status_code=status.HTTP_201_CREATED)
 async def create_hotel(
     data: SuggestedHotelCreate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Add suggested hotel."""
@@ -105,7 +105,7 @@ async def create_hotel(
 
 @router.get("/", response_model=List[SuggestedHotelResponse])
 async def list_hotels(
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """List all suggested hotels."""
@@ -123,7 +123,7 @@ async def list_hotels(
 async def update_hotel(
     hotel_id: UUID,
     data: SuggestedHotelUpdate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update hotel."""
@@ -154,7 +154,7 @@ async def update_hotel(
 @router.delete("/{hotel_id}", response_model=SuccessResponse)
 async def delete_hotel(
     hotel_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Remove hotel."""
@@ -188,7 +188,7 @@ async def delete_hotel(
 @router.put("/reorder", response_model=SuccessResponse)
 async def reorder_hotels(
     data: ReorderRequest,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update display order of hotels."""
@@ -8,18 +8,19 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import Wedding, MediaUpload, Guest, FileType
+from app.database import get_db, get_read_db
+from app.models import MediaUpload, Guest, FileType
 from app.schemas import (
     MediaUploadResponse,
     MediaListResponse,
     MediaApprovalUpdate,
     SuccessResponse
 )
-from app.utils.auth import get_current_wedding
+from app.utils.auth import get_current_principal, WeddingPrincipal
+from app.utils.pagination import encode_cursor, decode_cursor, estimate_row_count
 from app.config import settings
 
 router = APIRouter(prefix="/api/admin/media", tags=["Admin Media"])
@@ -29,45 +30,58 @@ router = APIRouter(prefix="/api/admin/media", tags=["Admin Media"])
 async def list_media(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     is_approved: Optional[bool] = None,
     guest_id: Optional[UUID] = None,
     event_tag: Optional[str] = None,
     file_type: Optional[str] = None,
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db)
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all uploads with filters."""
-    query = select(MediaUpload).where(MediaUpload.wedding_id == wedding.id)
-    count_query = select(func.count(MediaUpload.id)).where(MediaUpload.wedding_id == wedding.id)
+    """
+    List all uploads with filters.
+    Pass the returned next_cursor back as cursor for constant-time deep pages;
+    include_total=false replaces the exact COUNT with a planner estimate.
+    """
+    filters = [MediaUpload.wedding_id == wedding.id]
 
     # Apply filters
     if is_approved is not None:
-        query = query.where(MediaUpload.is_approved == is_approved)
-        count_query = count_query.where(MediaUpload.is_approved == is_approved)
+        filters.append(MediaUpload.is_approved == is_approved)
 
     if guest_id:
-        query = query.where(MediaUpload.guest_id == guest_id)
-        count_query = count_query.where(MediaUpload.guest_id == guest_id)
+        filters.append(MediaUpload.guest_id == guest_id)
 
     if event_tag:
-        query = query.where(MediaUpload.event_tag == event_tag)
-        count_query = count_query.where(MediaUpload.event_tag == event_tag)
+        filters.append(MediaUpload.event_tag == event_tag)
 
     if file_type:
-        query = query.where(MediaUpload.file_type == FileType(file_type))
-        count_query = count_query.where(MediaUpload.file_type == FileType(file_type))
+        filters.append(MediaUpload.file_type == FileType(file_type))
 
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(MediaUpload.uploaded_at.desc())
+    if include_total:
+        total_result = await db.execute(select(func.count(MediaUpload.id)).where(*filters))
+        total = total_result.scalar() or 0
+    else:
+        total = await estimate_row_count(db, select(MediaUpload.id).where(*filters))
+
+    # Apply pagination (keyset when a cursor is given, offset otherwise)
+    query = select(MediaUpload).where(*filters)
+    if cursor:
+        cursor_uploaded_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(MediaUpload.uploaded_at, MediaUpload.id) < (cursor_uploaded_at, cursor_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.order_by(MediaUpload.uploaded_at.desc(), MediaUpload.id.desc()).limit(page_size + 1)
     query = query.options(selectinload(MediaUpload.guest))
 
     result = await db.execute(query)
     media_items = result.scalars().all()
+    has_next = len(media_items) > page_size
+    media_items = media_items[:page_size]
 
     total_pages = math.ceil(total / page_size)
 
@@ -77,21 +91,24 @@ async def list_media(
         item.guest_name = m.guest.full_name if m.guest else None
         items.append(item)
 
+    last = media_items[-1] if media_items else None
     return MediaListResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
-        has_next=page < total_pages,
-        has_previous=page > 1
+        has_next=has_next,
+        has_previous=page > 1 or cursor is not None,
+        next_cursor=encode_cursor(last.uploaded_at, last.id) if has_next and last.uploaded_at else None,
+        total_is_estimate=not include_total
     )
 
 
 @router.put("/{media_id}/approve", response_model=MediaUploadResponse)
 async def approve_media(
     media_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Approve media."""
@@ -121,7 +138,7 @@ async def approve_media(
 @router.put("/{media_id}/reject", response_model=SuccessResponse)
 async def reject_media(
     media_id: UUID,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Reject/delete media."""
@@ -158,8 +175,8 @@ async def reject_media(
 
 @router.get("/download-all")
 async def download_all_media(
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db)
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Download all media as zip."""
     result = await db.execute(
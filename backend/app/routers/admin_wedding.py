@@ -1,6 +1,7 @@
 import os
 import uuid as uuid_lib
 import aiofiles
+from functools import partial
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,11 +9,15 @@ from sqlalchemy import select, func, desc, union_all, literal, cast, String
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.database import get_db, get_read_db, run_after_commit
 from app.models import Wedding, Guest, TravelInfo, HotelInfo, GuestActivity, GuestFoodPreference, GuestDressPreference, MediaUpload, RSVPStatus, Activity
 from app.schemas import WeddingResponse, WeddingUpdate, SuccessResponse
-from app.utils.auth import get_current_wedding
+from app.utils.auth import (
+    get_current_wedding, get_current_principal, WeddingPrincipal,
+    invalidate_wedding_principal
+)
 from app.config import settings
+from app.utils.query_budget import query_budget
 
 router = APIRouter(prefix="/api/admin/wedding", tags=["Admin Wedding"])
 
@@ -81,6 +86,9 @@ async def update_wedding(
     await db.flush()
     await db.refresh(wedding)
 
+    if "is_active" in update_data:
+        run_after_commit(db, partial(invalidate_wedding_principal, wedding.id))
+
     return WeddingResponse.model_validate(wedding)
 
 
@@ -121,9 +129,10 @@ async def upload_cover_image(
 
 
 @router.get("/dashboard-stats", response_model=DashboardStats)
+@query_budget(23)
 async def get_dashboard_stats(
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db)
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get summary statistics."""
     # Total guests
@@ -338,23 +347,26 @@ async def get_dashboard_stats(
 
     # Per-event attendance stats
     event_stats: list[EventAttendanceStats] = []
+    registrations = (
+        select(
+            GuestActivity.activity_id,
+            func.count(GuestActivity.id).label("attending_count"),
+            func.sum(GuestActivity.number_of_participants).label("total_attendees")
+        )
+        .join(Activity, Activity.id == GuestActivity.activity_id)
+        .where(Activity.wedding_id == wedding.id)
+        .group_by(GuestActivity.activity_id)
+        .subquery()
+    )
     events_result = await db.execute(
-        select(Activity)
+        select(Activity, registrations.c.attending_count, registrations.c.total_attendees)
+        .outerjoin(registrations, registrations.c.activity_id == Activity.id)
         .where(Activity.wedding_id == wedding.id, Activity.requires_signup == True)
         .order_by(Activity.display_order, Activity.date_time)
     )
-    for evt in events_result.scalars().all():
-        reg_count_result = await db.execute(
-            select(func.count(GuestActivity.id))
-            .where(GuestActivity.activity_id == evt.id)
-        )
-        attending_count = reg_count_result.scalar() or 0
-
-        attendees_result = await db.execute(
-            select(func.coalesce(func.sum(GuestActivity.number_of_participants), 0))
-            .where(GuestActivity.activity_id == evt.id)
-        )
-        evt_total_attendees = attendees_result.scalar() or 0
+    for evt, attending_count, evt_total_attendees in events_result.all():
+        attending_count = attending_count or 0
+        evt_total_attendees = evt_total_attendees or 0
 
         event_stats.append(EventAttendanceStats(
             activity_id=str(evt.id),
@@ -1,9 +1,10 @@
+from functools import partial
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, Field
 
-from app.database import get_db
+from app.database import get_db, run_after_commit
 from app.models import Wedding
 from app.schemas import (
     WeddingCreate,
@@ -13,10 +14,12 @@ from app.schemas import (
     SuccessResponse
 )
 from app.utils.auth import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
     create_access_token,
-    get_current_wedding
+    get_current_wedding,
+    invalidate_wedding_principal
 )
 
 router = APIRouter(prefix="/api/admin/auth", tags=["Admin Auth"])
@@ -54,7 +57,7 @@ async def register_wedding(
         welcome_message=data.welcome_message,
         cover_image_url=data.cover_image_url,
         admin_email=data.admin_email,
-        admin_password_hash=hash_password(data.admin_password),
+        admin_password_hash=await hash_password_async(data.admin_password),
         is_active=True
     )
 
@@ -84,7 +87,7 @@ async def login(
     )
     wedding = result.scalar_one_or_none()
 
-    if not wedding or not verify_password(data.password, wedding.admin_password_hash):
+    if not wedding or not await verify_password_async(data.password, wedding.admin_password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -96,6 +99,11 @@ async def login(
             detail="Account is deactivated"
         )
 
+    # Upgrade legacy SHA256 (or outdated bcrypt) hashes now that we have the plaintext
+    if password_needs_rehash(wedding.admin_password_hash):
+        wedding.admin_password_hash = await hash_password_async(data.password)
+        await db.flush()
+
     access_token = create_access_token(wedding.id)
 
     return AdminLoginResponse(
@@ -121,13 +129,14 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Update admin password."""
-    if not verify_password(data.current_password, wedding.admin_password_hash):
+    if not await verify_password_async(data.current_password, wedding.admin_password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
 
-    wedding.admin_password_hash = hash_password(data.new_password)
+    wedding.admin_password_hash = await hash_password_async(data.new_password)
     await db.flush()
+    run_after_commit(db, partial(invalidate_wedding_principal, wedding.id))
 
     return SuccessResponse(message="Password updated successfully")
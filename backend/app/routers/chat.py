@@ -6,9 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.ai_chat_service import get_chat_response, get_streaming_response
 from app.database import get_db
+from app.utils.rate_limit import RateLimit, rate_limit
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+CHAT_IP_LIMIT = RateLimit("chat-ip", capacity=10, per_seconds=60)
+
 
 class ChatMessage(BaseModel):
     role: str  # "user" or "assistant"
@@ -27,6 +30,7 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/", response_model=ChatResponse)
+@rate_limit(CHAT_IP_LIMIT)
 async def chat(request: ChatRequest, db: AsyncSession = Depends(get_db)):
     """Send message to AI chatbot."""
 
@@ -48,6 +52,7 @@ async def chat(request: ChatRequest, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/stream")
+@rate_limit(CHAT_IP_LIMIT)
 async def chat_stream(request: ChatRequest, db: AsyncSession = Depends(get_db)):
     """Stream AI chatbot response."""
 
@@ -5,16 +5,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
 
-from app.database import get_db
-from app.models import Guest, Wedding
+from app.database import get_db, get_read_db
+from app.models import Guest
 from app.models.chatbot_settings import ChatbotSettings
 from app.models.chatbot_log import ChatbotLog
 from app.services import rada_service
-from app.services.guest_service import get_guest_by_token
-from app.utils.auth import get_current_wedding
+from app.services.guest_service import resolve_guest_token
+from app.utils.auth import get_current_principal, WeddingPrincipal
+from app.utils.rate_limit import RateLimit, enforce_rate_limit, rate_limit
 
 router = APIRouter(prefix="/api/chatbot", tags=["Chatbot"])
 
+CHATBOT_IP_LIMIT = RateLimit("chatbot-ip", capacity=120, per_seconds=60)
+# Every chat message is an LLM call
+CHAT_TOKEN_LIMIT = RateLimit("chat-token", capacity=10, per_seconds=60, key="guest_token")
+CHAT_WEDDING_LIMIT = RateLimit("chat-wedding", capacity=600, per_seconds=3600, key="wedding")
+
 
 # ── Request/Response Models ──────────────────────────────────────────
 
@@ -60,13 +66,15 @@ class FeedbackRequest(BaseModel):
 # ── Guest-facing Endpoints ───────────────────────────────────────────
 
 @router.post("/chat/{guest_token}", response_model=GuestChatResponse)
+@rate_limit(CHATBOT_IP_LIMIT, CHAT_TOKEN_LIMIT)
 async def guest_chat(
     guest_token: str,
     request: GuestChatRequest,
     db: AsyncSession = Depends(get_db),
 ):
     """Process a chat message from a guest."""
-    guest = await get_guest_by_token(guest_token, db, update_last_accessed=False)
+    guest = await resolve_guest_token(guest_token, db, update_last_accessed=False)
+    await enforce_rate_limit(CHAT_WEDDING_LIMIT, guest.wedding_id)
 
     history = [{"role": m.role, "content": m.content} for m in request.conversation_history]
 
@@ -88,12 +96,13 @@ async def guest_chat(
 
 
 @router.get("/settings/{guest_token}", response_model=ChatbotSettingsResponse)
+@rate_limit(CHATBOT_IP_LIMIT)
 async def get_guest_chatbot_settings(
     guest_token: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get chatbot settings for the guest's wedding (name, greeting, suggested questions)."""
-    guest = await get_guest_by_token(guest_token, db, update_last_accessed=False)
+    guest = await resolve_guest_token(guest_token, db, update_last_accessed=False)
 
     settings = await rada_service.get_chatbot_settings(guest.wedding_id, db)
 
@@ -111,6 +120,7 @@ async def get_guest_chatbot_settings(
 
 
 @router.post("/feedback")
+@rate_limit(CHATBOT_IP_LIMIT)
 async def submit_feedback(
     request: FeedbackRequest,
     db: AsyncSession = Depends(get_db),
@@ -138,8 +148,8 @@ async def submit_feedback(
 
 @router.get("/admin/settings", response_model=ChatbotSettingsResponse)
 async def get_admin_chatbot_settings(
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get chatbot settings for admin."""
     settings = await rada_service.get_chatbot_settings(wedding.id, db)
@@ -158,7 +168,7 @@ async def get_admin_chatbot_settings(
 @router.put("/admin/settings", response_model=ChatbotSettingsResponse)
 async def update_admin_chatbot_settings(
     data: ChatbotSettingsUpdate,
-    wedding: Wedding = Depends(get_current_wedding),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update chatbot settings for admin."""
@@ -196,8 +206,8 @@ async def update_admin_chatbot_settings(
 
 @router.get("/admin/stats")
 async def get_admin_chatbot_stats(
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get chatbot analytics stats."""
     return await rada_service.get_chatbot_stats(wedding.id, db)
@@ -208,8 +218,8 @@ async def get_admin_chatbot_logs(
     limit: int = 50,
     offset: int = 0,
     session_id: Optional[str] = None,
-    wedding: Wedding = Depends(get_current_wedding),
-    db: AsyncSession = Depends(get_db),
+    wedding: WeddingPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get chatbot conversation logs."""
     return await rada_service.get_chat_logs(
@@ -11,6 +11,7 @@ from app.services.event_service import EventService
 from app.schemas.event import EventCreate, EventUpdate, EventResponse
 from app.schemas.common import MessageResponse
 from app.config import settings
+from app.utils.query_budget import query_budget
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
@@ -34,6 +35,7 @@ async def create_event(
 
 
 @router.get("", response_model=list[EventResponse])
+@query_budget(2)
 async def get_events(
     is_active: Optional[bool] = None,
     event_type: Optional[str] = None,
@@ -42,18 +44,17 @@ async def get_events(
     """Get all events with optional filters."""
     service = EventService(db)
     events = await service.get_events(is_active=is_active, event_type=event_type)
+    stats = await service.get_events_stats([event.id for event in events])
 
-    result = []
-    for event in events:
-        stats = await service.get_event_stats(event.id)
-        result.append(EventResponse(
+    return [
+        EventResponse(
             **event.__dict__,
             is_upcoming=event.is_upcoming,
-            confirmed_guests_count=stats["confirmed_guests"],
-            total_invitations=stats["total_invitations"]
-        ))
-
-    return result
+            confirmed_guests_count=stats[event.id]["confirmed_guests"],
+            total_invitations=stats[event.id]["total_invitations"]
+        )
+        for event in events
+    ]
 
 
 @router.get("/{event_id}", response_model=EventResponse)
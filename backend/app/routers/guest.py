@@ -1,28 +1,49 @@
 import os
+import uuid as uuid_lib
 from typing import Optional, List
 from uuid import UUID
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from datetime import date, datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from pydantic import BaseModel, Field
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import (
     Guest, TravelInfo, HotelInfo, SuggestedHotel,
     GuestDressPreference, GuestFoodPreference, MealSizePreference,
-    Activity, GuestActivity, MediaUpload, RSVPStatus
+    Activity, GuestActivity, ActivityWaitlist, MediaUpload, RSVPStatus
 )
 from app.schemas import SuccessResponse
+from app.services.activity_service import (
+    adjust_reservations,
+    reserve_seats,
+    promote_waitlists,
+    waitlist_position
+)
 from app.services.guest_service import (
     get_guest_by_token,
+    resolve_guest_token,
+    touch_last_accessed,
+    sync_activity_registrations,
     get_complete_portal_data,
     validate_and_save_file
 )
 from app.config import settings
+from app.utils.idempotency import idempotent
+from app.utils.query_budget import query_budget
+from app.utils.rate_limit import RateLimit, rate_limit
+from app.utils.upsert import upsert_row, upsert_rows
 
 router = APIRouter(prefix="/api/guest", tags=["Guest Portal"])
 
+# Generous per IP since a whole venue can share one address; the per-token
+# bucket caps what a leaked or scraped link can do
+GUEST_IP_LIMIT = RateLimit("guest-ip", capacity=300, per_seconds=60)
+GUEST_TOKEN_LIMIT = RateLimit("guest-token", capacity=120, per_seconds=60, key="token")
+guest_rate_limit = rate_limit(GUEST_IP_LIMIT, GUEST_TOKEN_LIMIT)
+
 
 # Request/Response schemas for guest endpoints
 class PartyMember(BaseModel):
@@ -84,6 +105,15 @@ class FoodPreferenceUpdate(BaseModel):
     meal_size_preference: Optional[str] = None
 
 
+class GuestSectionsUpdate(BaseModel):
+    """Any subset of the guest's editable sections, saved together."""
+    rsvp: Optional[RSVPUpdate] = None
+    travel: Optional[TravelInfoUpdate] = None
+    hotel: Optional[HotelInfoUpdate] = None
+    food: Optional[FoodPreferenceUpdate] = None
+    dress_preferences: Optional[List[DressPreferenceUpdate]] = None
+
+
 class ActivityRegistration(BaseModel):
     number_of_participants: int = Field(default=1, ge=1)
     notes: Optional[str] = None
@@ -101,25 +131,33 @@ class MediaUploadResponse(BaseModel):
 
 
 @router.get("/{token}")
+@guest_rate_limit
 async def get_guest_portal(
     token: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db)
 ):
     """Get complete guest portal data in single response."""
-    guest = await get_guest_by_token(token, db, update_last_accessed=True)
+    guest = await get_guest_by_token(token, db, update_last_accessed=False, load_wedding=True)
+    await touch_last_accessed(guest.id, write_db)
     portal_data = await get_complete_portal_data(guest, db)
     return portal_data
 
 
-@router.put("/{token}/rsvp")
-async def update_rsvp(
-    token: str,
-    data: RSVPUpdate,
-    db: AsyncSession = Depends(get_db)
-):
-    """Update guest RSVP status and info."""
-    guest = await get_guest_by_token(token, db)
+def _parse_date(value: Optional[str], field: str) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {field} format. Use YYYY-MM-DD"
+        )
 
+
+async def _save_rsvp(guest: Guest, data: RSVPUpdate, db: AsyncSession) -> set[UUID]:
+    """Apply an RSVP to the guest; returns activities that freed seats."""
     # Validate RSVP status
     try:
         rsvp_status = RSVPStatus(data.rsvp_status)
@@ -151,39 +189,153 @@ async def update_rsvp(
         guest.number_of_attendees = data.number_of_attendees
 
     # Handle activity registrations
-    if data.activity_ids is not None:
-        # Clear existing registrations
-        existing_result = await db.execute(
-            select(GuestActivity).where(GuestActivity.guest_id == guest.id)
+    if data.activity_ids is None:
+        return set()
+    return await sync_activity_registrations(
+        guest.id, guest.wedding_id, data.activity_ids, guest.number_of_attendees, db
+    )
+
+
+async def _save_travel(guest_id: UUID, data: TravelInfoUpdate, db: AsyncSession) -> TravelInfo:
+    return await upsert_row(db, TravelInfo, {
+        "guest_id": guest_id,
+        "arrival_date": _parse_date(data.arrival_date, "arrival_date"),
+        "arrival_time": data.arrival_time,
+        "arrival_flight_number": data.arrival_flight_number,
+        "arrival_airport": data.arrival_airport,
+        "departure_date": _parse_date(data.departure_date, "departure_date"),
+        "departure_time": data.departure_time,
+        "departure_flight_number": data.departure_flight_number,
+        "needs_pickup": data.needs_pickup,
+        "needs_dropoff": data.needs_dropoff,
+        "special_requirements": data.special_requirements,
+    }, conflict_columns=["guest_id"])
+
+
+async def _save_hotel(
+    guest_id: UUID,
+    wedding_id: UUID,
+    data: HotelInfoUpdate,
+    db: AsyncSession
+) -> HotelInfo:
+    # Validate suggested_hotel_id if provided
+    if data.suggested_hotel_id:
+        hotel_result = await db.execute(
+            select(SuggestedHotel.id).where(
+                SuggestedHotel.id == data.suggested_hotel_id,
+                SuggestedHotel.wedding_id == wedding_id
+            )
         )
-        existing_registrations = existing_result.scalars().all()
-        for reg in existing_registrations:
-            await db.delete(reg)
-        await db.flush()
-
-        # Create new registrations
-        for activity_id_str in data.activity_ids:
-            try:
-                activity_uuid = UUID(activity_id_str)
-            except ValueError:
-                continue
-
-            # Verify activity exists and belongs to same wedding
-            activity_result = await db.execute(
-                select(Activity).where(
-                    Activity.id == activity_uuid,
-                    Activity.wedding_id == guest.wedding_id
-                )
+        if not hotel_result.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Suggested hotel not found"
+            )
+
+    return await upsert_row(db, HotelInfo, {
+        "guest_id": guest_id,
+        "suggested_hotel_id": data.suggested_hotel_id,
+        "custom_hotel_name": data.custom_hotel_name,
+        "custom_hotel_address": data.custom_hotel_address,
+        "check_in_date": _parse_date(data.check_in_date, "check_in_date"),
+        "check_out_date": _parse_date(data.check_out_date, "check_out_date"),
+        "room_type": data.room_type,
+        "number_of_rooms": data.number_of_rooms,
+        "special_requests": data.special_requests,
+        "booking_confirmation": data.booking_confirmation,
+    }, conflict_columns=["guest_id"])
+
+
+async def _save_dress_preferences(
+    guest_id: UUID,
+    items: List[DressPreferenceUpdate],
+    db: AsyncSession
+) -> list[GuestDressPreference]:
+    # One row per dress code; a later entry for the same code wins
+    latest = {item.dress_code_id: item for item in items}
+    return await upsert_rows(db, GuestDressPreference, [
+        {
+            "guest_id": guest_id,
+            "dress_code_id": item.dress_code_id,
+            "planned_outfit_description": item.planned_outfit_description,
+            "color_choice": item.color_choice,
+            "needs_shopping_assistance": item.needs_shopping_assistance,
+            "notes": item.notes,
+        }
+        for item in latest.values()
+    ], conflict_columns=["guest_id", "dress_code_id"])
+
+
+async def _save_food(guest_id: UUID, data: FoodPreferenceUpdate, db: AsyncSession) -> GuestFoodPreference:
+    # Parse meal size preference
+    meal_size = None
+    if data.meal_size_preference:
+        try:
+            meal_size = MealSizePreference(data.meal_size_preference)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid meal_size_preference. Must be one of: small, regular, large"
             )
-            activity = activity_result.scalar_one_or_none()
-            if activity:
-                registration = GuestActivity(
-                    guest_id=guest.id,
-                    activity_id=activity_uuid,
-                    number_of_participants=guest.number_of_attendees,
-                    registered_at=datetime.utcnow()
-                )
-                db.add(registration)
+
+    return await upsert_row(db, GuestFoodPreference, {
+        "guest_id": guest_id,
+        "dietary_restrictions": data.dietary_restrictions,
+        "allergies": data.allergies,
+        "cuisine_preferences": data.cuisine_preferences,
+        "special_requests": data.special_requests,
+        "meal_size_preference": meal_size,
+    }, conflict_columns=["guest_id"])
+
+
+@router.put("/{token}/sections")
+@guest_rate_limit
+@idempotent
+async def save_guest_sections(
+    token: str,
+    data: GuestSectionsUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Save any subset of the RSVP, travel, hotel, food and dress sections in
+    one transaction and return the updated portal data.
+    """
+    guest = await get_guest_by_token(token, db, load_wedding=True)
+
+    if data.rsvp is not None:
+        freed = await _save_rsvp(guest, data.rsvp, db)
+        if freed:
+            background_tasks.add_task(promote_waitlists, *freed)
+    if data.travel is not None:
+        await _save_travel(guest.id, data.travel, db)
+    if data.hotel is not None:
+        await _save_hotel(guest.id, guest.wedding_id, data.hotel, db)
+    if data.food is not None:
+        await _save_food(guest.id, data.food, db)
+    if data.dress_preferences:
+        await _save_dress_preferences(guest.id, data.dress_preferences, db)
+
+    await db.flush()
+    return await get_complete_portal_data(guest, db)
+
+
+@router.put("/{token}/rsvp")
+@guest_rate_limit
+@idempotent
+@query_budget(11)
+async def update_rsvp(
+    token: str,
+    data: RSVPUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update guest RSVP status and info."""
+    guest = await get_guest_by_token(token, db)
+
+    freed = await _save_rsvp(guest, data, db)
+    if freed:
+        background_tasks.add_task(promote_waitlists, *freed)
 
     await db.flush()
     await db.refresh(guest)
@@ -204,74 +356,15 @@ async def update_rsvp(
 
 
 @router.put("/{token}/travel")
+@guest_rate_limit
 async def update_travel_info(
     token: str,
     data: TravelInfoUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create or update travel information (upsert)."""
-    guest = await get_guest_by_token(token, db)
-
-    # Check if travel info exists
-    result = await db.execute(
-        select(TravelInfo).where(TravelInfo.guest_id == guest.id)
-    )
-    travel_info = result.scalar_one_or_none()
-
-    # Parse dates
-    from datetime import date
-    arrival_date = None
-    departure_date = None
-
-    if data.arrival_date:
-        try:
-            arrival_date = date.fromisoformat(data.arrival_date)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid arrival_date format. Use YYYY-MM-DD"
-            )
-
-    if data.departure_date:
-        try:
-            departure_date = date.fromisoformat(data.departure_date)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid departure_date format. Use YYYY-MM-DD"
-            )
-
-    if travel_info:
-        # Update existing
-        travel_info.arrival_date = arrival_date
-        travel_info.arrival_time = data.arrival_time
-        travel_info.arrival_flight_number = data.arrival_flight_number
-        travel_info.arrival_airport = data.arrival_airport
-        travel_info.departure_date = departure_date
-        travel_info.departure_time = data.departure_time
-        travel_info.departure_flight_number = data.departure_flight_number
-        travel_info.needs_pickup = data.needs_pickup
-        travel_info.needs_dropoff = data.needs_dropoff
-        travel_info.special_requirements = data.special_requirements
-    else:
-        # Create new
-        travel_info = TravelInfo(
-            guest_id=guest.id,
-            arrival_date=arrival_date,
-            arrival_time=data.arrival_time,
-            arrival_flight_number=data.arrival_flight_number,
-            arrival_airport=data.arrival_airport,
-            departure_date=departure_date,
-            departure_time=data.departure_time,
-            departure_flight_number=data.departure_flight_number,
-            needs_pickup=data.needs_pickup,
-            needs_dropoff=data.needs_dropoff,
-            special_requirements=data.special_requirements
-        )
-        db.add(travel_info)
-
-    await db.flush()
-    await db.refresh(travel_info)
+    guest = await resolve_guest_token(token, db)
+    travel_info = await _save_travel(guest.id, data, db)
 
     return {
         "id": str(travel_info.id),
@@ -289,86 +382,15 @@ async def update_travel_info(
 
 
 @router.put("/{token}/hotel")
+@guest_rate_limit
 async def update_hotel_info(
     token: str,
     data: HotelInfoUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create or update hotel information (upsert)."""
-    guest = await get_guest_by_token(token, db)
-
-    # Validate suggested_hotel_id if provided
-    if data.suggested_hotel_id:
-        hotel_result = await db.execute(
-            select(SuggestedHotel).where(
-                SuggestedHotel.id == data.suggested_hotel_id,
-                SuggestedHotel.wedding_id == guest.wedding_id
-            )
-        )
-        if not hotel_result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Suggested hotel not found"
-            )
-
-    # Check if hotel info exists
-    result = await db.execute(
-        select(HotelInfo).where(HotelInfo.guest_id == guest.id)
-    )
-    hotel_info = result.scalar_one_or_none()
-
-    # Parse dates
-    from datetime import date
-    check_in_date = None
-    check_out_date = None
-
-    if data.check_in_date:
-        try:
-            check_in_date = date.fromisoformat(data.check_in_date)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid check_in_date format. Use YYYY-MM-DD"
-            )
-
-    if data.check_out_date:
-        try:
-            check_out_date = date.fromisoformat(data.check_out_date)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid check_out_date format. Use YYYY-MM-DD"
-            )
-
-    if hotel_info:
-        # Update existing
-        hotel_info.suggested_hotel_id = data.suggested_hotel_id
-        hotel_info.custom_hotel_name = data.custom_hotel_name
-        hotel_info.custom_hotel_address = data.custom_hotel_address
-        hotel_info.check_in_date = check_in_date
-        hotel_info.check_out_date = check_out_date
-        hotel_info.room_type = data.room_type
-        hotel_info.number_of_rooms = data.number_of_rooms
-        hotel_info.special_requests = data.special_requests
-        hotel_info.booking_confirmation = data.booking_confirmation
-    else:
-        # Create new
-        hotel_info = HotelInfo(
-            guest_id=guest.id,
-            suggested_hotel_id=data.suggested_hotel_id,
-            custom_hotel_name=data.custom_hotel_name,
-            custom_hotel_address=data.custom_hotel_address,
-            check_in_date=check_in_date,
-            check_out_date=check_out_date,
-            room_type=data.room_type,
-            number_of_rooms=data.number_of_rooms,
-            special_requests=data.special_requests,
-            booking_confirmation=data.booking_confirmation
-        )
-        db.add(hotel_info)
-
-    await db.flush()
-    await db.refresh(hotel_info)
+    guest = await resolve_guest_token(token, db)
+    hotel_info = await _save_hotel(guest.id, guest.wedding_id, data, db)
 
     return {
         "id": str(hotel_info.id),
@@ -385,43 +407,15 @@ async def update_hotel_info(
 
 
 @router.put("/{token}/dress-preference")
+@guest_rate_limit
 async def update_dress_preference(
     token: str,
     data: DressPreferenceUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create or update dress preference for specific event (upsert)."""
-    guest = await get_guest_by_token(token, db)
-
-    # Check if dress preference exists for this guest + dress_code
-    result = await db.execute(
-        select(GuestDressPreference).where(
-            GuestDressPreference.guest_id == guest.id,
-            GuestDressPreference.dress_code_id == data.dress_code_id
-        )
-    )
-    dress_pref = result.scalar_one_or_none()
-
-    if dress_pref:
-        # Update existing
-        dress_pref.planned_outfit_description = data.planned_outfit_description
-        dress_pref.color_choice = data.color_choice
-        dress_pref.needs_shopping_assistance = data.needs_shopping_assistance
-        dress_pref.notes = data.notes
-    else:
-        # Create new
-        dress_pref = GuestDressPreference(
-            guest_id=guest.id,
-            dress_code_id=data.dress_code_id,
-            planned_outfit_description=data.planned_outfit_description,
-            color_choice=data.color_choice,
-            needs_shopping_assistance=data.needs_shopping_assistance,
-            notes=data.notes
-        )
-        db.add(dress_pref)
-
-    await db.flush()
-    await db.refresh(dress_pref)
+    guest = await resolve_guest_token(token, db)
+    [dress_pref] = await _save_dress_preferences(guest.id, [data], db)
 
     return {
         "id": str(dress_pref.id),
@@ -434,52 +428,15 @@ async def update_dress_preference(
 
 
 @router.put("/{token}/food-preference")
+@guest_rate_limit
 async def update_food_preference(
     token: str,
     data: FoodPreferenceUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create or update food preferences (upsert)."""
-    guest = await get_guest_by_token(token, db)
-
-    # Parse meal size preference
-    meal_size = None
-    if data.meal_size_preference:
-        try:
-            meal_size = MealSizePreference(data.meal_size_preference)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid meal_size_preference. Must be one of: small, regular, large"
-            )
-
-    # Check if food preference exists
-    result = await db.execute(
-        select(GuestFoodPreference).where(GuestFoodPreference.guest_id == guest.id)
-    )
-    food_pref = result.scalar_one_or_none()
-
-    if food_pref:
-        # Update existing
-        food_pref.dietary_restrictions = data.dietary_restrictions
-        food_pref.allergies = data.allergies
-        food_pref.cuisine_preferences = data.cuisine_preferences
-        food_pref.special_requests = data.special_requests
-        food_pref.meal_size_preference = meal_size
-    else:
-        # Create new
-        food_pref = GuestFoodPreference(
-            guest_id=guest.id,
-            dietary_restrictions=data.dietary_restrictions,
-            allergies=data.allergies,
-            cuisine_preferences=data.cuisine_preferences,
-            special_requests=data.special_requests,
-            meal_size_preference=meal_size
-        )
-        db.add(food_pref)
-
-    await db.flush()
-    await db.refresh(food_pref)
+    guest = await resolve_guest_token(token, db)
+    food_pref = await _save_food(guest.id, data, db)
 
     return {
         "id": str(food_pref.id),
@@ -492,6 +449,8 @@ async def update_food_preference(
 
 
 @router.post("/{token}/activities/{activity_id}/register")
+@guest_rate_limit
+@idempotent
 async def register_for_activity(
     token: str,
     activity_id: UUID,
@@ -499,7 +458,7 @@ async def register_for_activity(
     db: AsyncSession = Depends(get_db)
 ):
     """Register for an activity."""
-    guest = await get_guest_by_token(token, db)
+    guest = await resolve_guest_token(token, db)
 
     # Get activity
     activity_result = await db.execute(
@@ -529,31 +488,33 @@ async def register_for_activity(
             detail="Already registered for this activity"
         )
 
-    # Check max participants if set
-    if activity.max_participants:
-        count_result = await db.execute(
-            select(func.sum(GuestActivity.number_of_participants))
-            .where(GuestActivity.activity_id == activity_id)
+    # Take the seats atomically; the unique (guest_id, activity_id)
+    # constraint settles a concurrent double registration
+    if not await reserve_seats(activity_id, data.number_of_participants, db):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Activity is full. Maximum {activity.max_participants} participants allowed."
         )
-        current_count = count_result.scalar() or 0
 
-        if current_count + data.number_of_participants > activity.max_participants:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Activity is full. Maximum {activity.max_participants} participants allowed."
-            )
-
-    # Create registration
-    registration = GuestActivity(
-        guest_id=guest.id,
-        activity_id=activity_id,
-        number_of_participants=data.number_of_participants,
-        notes=data.notes,
-        registered_at=datetime.utcnow()
+    result = await db.execute(
+        insert(GuestActivity)
+        .values(
+            id=uuid_lib.uuid4(),
+            guest_id=guest.id,
+            activity_id=activity_id,
+            number_of_participants=data.number_of_participants,
+            notes=data.notes,
+            registered_at=datetime.utcnow()
+        )
+        .on_conflict_do_nothing(constraint="uq_guest_activity")
+        .returning(GuestActivity)
     )
-    db.add(registration)
-    await db.flush()
-    await db.refresh(registration)
+    registration = result.scalar_one_or_none()
+    if registration is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already registered for this activity"
+        )
 
     return {
         "id": str(registration.id),
@@ -566,13 +527,15 @@ async def register_for_activity(
 
 
 @router.delete("/{token}/activities/{activity_id}/unregister")
+@guest_rate_limit
 async def unregister_from_activity(
     token: str,
     activity_id: UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Remove activity registration."""
-    guest = await get_guest_by_token(token, db)
+    guest = await resolve_guest_token(token, db)
 
     # Find registration
     result = await db.execute(
@@ -591,11 +554,109 @@ async def unregister_from_activity(
 
     await db.delete(registration)
     await db.flush()
+    await adjust_reservations({activity_id: -registration.number_of_participants}, db)
+    # Runs after the response, once the freed seats are committed
+    background_tasks.add_task(promote_waitlists, activity_id)
 
     return SuccessResponse(message="Successfully unregistered from activity")
 
 
+@router.post("/{token}/activities/{activity_id}/waitlist")
+@guest_rate_limit
+async def join_activity_waitlist(
+    token: str,
+    activity_id: UUID,
+    data: ActivityRegistration,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue for a full activity; seats are handed out first come, first served."""
+    guest = await resolve_guest_token(token, db)
+
+    activity_result = await db.execute(
+        select(Activity).where(
+            Activity.id == activity_id,
+            Activity.wedding_id == guest.wedding_id
+        )
+    )
+    activity = activity_result.scalar_one_or_none()
+
+    if not activity:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Activity not found"
+        )
+
+    if activity.max_participants and data.number_of_participants > activity.max_participants:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"This activity only has {activity.max_participants} places in total"
+        )
+
+    registered_result = await db.execute(
+        select(GuestActivity.id).where(
+            GuestActivity.guest_id == guest.id,
+            GuestActivity.activity_id == activity_id
+        )
+    )
+    if registered_result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already registered for this activity"
+        )
+
+    await db.execute(
+        insert(ActivityWaitlist)
+        .values(
+            id=uuid_lib.uuid4(),
+            activity_id=activity_id,
+            guest_id=guest.id,
+            number_of_participants=data.number_of_participants,
+            notes=data.notes,
+            enqueued_at=datetime.utcnow()
+        )
+        .on_conflict_do_nothing(constraint="uq_activity_waitlist_guest")
+    )
+    # Seats may have been freed before this guest joined
+    background_tasks.add_task(promote_waitlists, activity_id)
+
+    return {
+        "activity_id": str(activity_id),
+        "activity_name": activity.activity_name,
+        "position": await waitlist_position(activity_id, guest.id, db)
+    }
+
+
+@router.delete("/{token}/activities/{activity_id}/waitlist")
+@guest_rate_limit
+async def leave_activity_waitlist(
+    token: str,
+    activity_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Leave an activity's waitlist."""
+    guest = await resolve_guest_token(token, db)
+
+    result = await db.execute(
+        delete(ActivityWaitlist)
+        .where(
+            ActivityWaitlist.activity_id == activity_id,
+            ActivityWaitlist.guest_id == guest.id
+        )
+        .returning(ActivityWaitlist.id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not on the waitlist for this activity"
+        )
+
+    return SuccessResponse(message="Left the activity waitlist")
+
+
 @router.post("/{token}/media/upload")
+@guest_rate_limit
+@idempotent
 async def upload_media(
     token: str,
     file: UploadFile = File(...),
@@ -604,7 +665,7 @@ async def upload_media(
     db: AsyncSession = Depends(get_db)
 ):
     """Upload image or video file."""
-    guest = await get_guest_by_token(token, db)
+    guest = await resolve_guest_token(token, db)
 
     # Validate and save file
     file_url, file_type, file_size, thumbnail_url = await validate_and_save_file(
@@ -646,12 +707,13 @@ async def upload_media(
 
 
 @router.get("/{token}/media")
+@guest_rate_limit
 async def list_guest_media(
     token: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List guest's own uploads."""
-    guest = await get_guest_by_token(token, db, update_last_accessed=False)
+    guest = await resolve_guest_token(token, db, update_last_accessed=False)
 
     result = await db.execute(
         select(MediaUpload)
@@ -681,13 +743,14 @@ async def list_guest_media(
 
 
 @router.delete("/{token}/media/{media_id}")
+@guest_rate_limit
 async def delete_guest_media(
     token: str,
     media_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """Delete guest's own upload only."""
-    guest = await get_guest_by_token(token, db)
+    guest = await resolve_guest_token(token, db)
 
     # Find media - must belong to this guest
     result = await db.execute(
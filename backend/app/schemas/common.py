@@ -20,6 +20,8 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total_pages: int
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class SuccessResponse(BaseModel):
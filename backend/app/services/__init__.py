@@ -1,11 +1,17 @@
 from app.services.guest_service import (
     get_guest_by_token,
+    resolve_guest_token,
+    invalidate_guest_token,
+    GuestIdentity,
     get_complete_portal_data,
     validate_and_save_file
 )
 
 __all__ = [
     "get_guest_by_token",
+    "resolve_guest_token",
+    "invalidate_guest_token",
+    "GuestIdentity",
     "get_complete_portal_data",
     "validate_and_save_file"
 ]
@@ -0,0 +1,235 @@
+"""
+Activity seat accounting.
+
+Activity.reserved_participants holds the sum of number_of_participants over
+an activity's registrations. Every change to guest_activities goes through
+these helpers in the same transaction, so capacity checks are a single
+conditional UPDATE instead of a SUM, and concurrent signups cannot push an
+activity past max_participants. A max_participants of NULL or 0 means
+unlimited, as before.
+
+Guests who find an activity full can queue on activity_waitlist. Whenever
+seats are freed, promote_waitlists() registers queued guests first-in
+first-out; it runs as a background task after the freeing request has
+committed and coalesces activities queued by concurrent requests.
+"""
+import logging
+import uuid as uuid_lib
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import (
+    ColumnElement, Integer, column, delete, func, or_, select, update, values
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db_context
+from app.models import Activity, ActivityWaitlist, GuestActivity
+
+logger = logging.getLogger(__name__)
+
+# Waitlist entries read per round while promoting one activity
+PROMOTION_BATCH_SIZE = 100
+
+
+def _has_room(extra_seats) -> ColumnElement[bool]:
+    return or_(
+        Activity.max_participants.is_(None),
+        Activity.max_participants == 0,
+        Activity.reserved_participants + extra_seats <= Activity.max_participants
+    )
+
+
+async def reserve_seats(activity_id: UUID, seats: int, db: AsyncSession) -> bool:
+    """Take seats on an activity; False (and nothing changed) if it is full."""
+    result = await db.execute(
+        update(Activity)
+        .where(Activity.id == activity_id, _has_room(seats))
+        .values(reserved_participants=Activity.reserved_participants + seats)
+        .returning(Activity.id),
+        execution_options={"synchronize_session": False}
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def adjust_reservations(deltas: dict[UUID, int], db: AsyncSession) -> set[UUID]:
+    """
+    Apply per-activity seat changes in one statement.
+
+    Decreases always apply; increases only where the activity has room.
+    Returns the activities whose increase was refused, so the caller can
+    reject the request and roll the transaction back.
+    """
+    deltas = {activity_id: n for activity_id, n in deltas.items() if n}
+    if not deltas:
+        return set()
+
+    changes = values(
+        column("activity_id", PGUUID(as_uuid=True)),
+        column("delta", Integer),
+        name="changes"
+    ).data(list(deltas.items()))
+
+    result = await db.execute(
+        update(Activity)
+        .where(
+            Activity.id == changes.c.activity_id,
+            or_(changes.c.delta < 0, _has_room(changes.c.delta))
+        )
+        .values(reserved_participants=Activity.reserved_participants + changes.c.delta)
+        .returning(Activity.id),
+        execution_options={"synchronize_session": False}
+    )
+    return set(deltas) - set(result.scalars().all())
+
+
+async def release_guest_reservations(guest_id: UUID, db: AsyncSession) -> list[UUID]:
+    """
+    Give back every seat held by a guest; call before deleting the guest.
+    Returns the activities that got seats back, for ``promote_waitlists``.
+    """
+    held = (
+        select(
+            GuestActivity.activity_id,
+            func.sum(GuestActivity.number_of_participants).label("seats")
+        )
+        .where(GuestActivity.guest_id == guest_id)
+        .group_by(GuestActivity.activity_id)
+        .subquery()
+    )
+    result = await db.execute(
+        update(Activity)
+        .where(Activity.id == held.c.activity_id)
+        .values(reserved_participants=Activity.reserved_participants - held.c.seats)
+        .returning(Activity.id),
+        execution_options={"synchronize_session": False}
+    )
+    return list(result.scalars().all())
+
+
+async def waitlist_position(activity_id: UUID, guest_id: UUID, db: AsyncSession) -> int | None:
+    """1-based place of the guest in the activity's queue, or None."""
+    mine = (
+        select(ActivityWaitlist.enqueued_at)
+        .where(ActivityWaitlist.activity_id == activity_id, ActivityWaitlist.guest_id == guest_id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(func.count(ActivityWaitlist.id))
+        .where(ActivityWaitlist.activity_id == activity_id, ActivityWaitlist.enqueued_at <= mine)
+    )
+    return result.scalar() or None
+
+
+async def _promote_activity(activity_id: UUID, db: AsyncSession) -> int:
+    """Move queued guests into free seats, oldest first. Returns guests promoted."""
+    # The row lock holds off reserve_seats() until the promoted seats are counted
+    capacity = (await db.execute(
+        select(Activity.max_participants, Activity.reserved_participants)
+        .where(Activity.id == activity_id)
+        .with_for_update()
+    )).one_or_none()
+    if capacity is None:
+        return 0
+
+    max_participants, reserved = capacity
+    room = max_participants - reserved if max_participants else None
+    promoted_total = 0
+
+    while room is None or room > 0:
+        query = (
+            select(ActivityWaitlist)
+            .where(ActivityWaitlist.activity_id == activity_id)
+            .order_by(ActivityWaitlist.enqueued_at)
+            .limit(PROMOTION_BATCH_SIZE)
+        )
+        if max_participants:
+            # A party bigger than the whole activity can never be seated;
+            # leave it queued (capacity may be raised) but let others pass
+            query = query.where(ActivityWaitlist.number_of_participants <= max_participants)
+        entries = (await db.execute(query)).scalars().all()
+
+        # Strict FIFO: a party that does not fit blocks the ones behind it
+        promoted = []
+        planned = 0
+        for entry in entries:
+            if room is not None and planned + entry.number_of_participants > room:
+                break
+            promoted.append(entry)
+            planned += entry.number_of_participants
+        if not promoted:
+            break
+
+        now = datetime.utcnow()
+        inserted = await db.execute(
+            insert(GuestActivity)
+            .values([
+                {
+                    "id": uuid_lib.uuid4(),
+                    "guest_id": entry.guest_id,
+                    "activity_id": activity_id,
+                    "number_of_participants": entry.number_of_participants,
+                    "notes": entry.notes,
+                    "registered_at": now,
+                }
+                for entry in promoted
+            ])
+            # Guests who registered some other way meanwhile just leave the queue
+            .on_conflict_do_nothing(constraint="uq_guest_activity")
+            .returning(GuestActivity.number_of_participants)
+        )
+        party_sizes = inserted.scalars().all()
+        seats = sum(party_sizes)
+        await db.execute(
+            delete(ActivityWaitlist).where(ActivityWaitlist.id.in_([e.id for e in promoted])),
+            execution_options={"synchronize_session": False}
+        )
+        await db.execute(
+            update(Activity)
+            .where(Activity.id == activity_id)
+            .values(reserved_participants=Activity.reserved_participants + seats),
+            execution_options={"synchronize_session": False}
+        )
+        promoted_total += len(party_sizes)
+        # Only seats actually taken count; skipped conflicts leave room behind
+        if room is not None:
+            room -= seats
+
+        exhausted = len(entries) < PROMOTION_BATCH_SIZE and len(promoted) == len(entries)
+        if exhausted or (seats == planned and len(promoted) < len(entries)):
+            break
+
+    return promoted_total
+
+
+_pending_promotions: set[UUID] = set()
+_promoting = False
+
+
+async def promote_waitlists(*activity_ids: UUID) -> None:
+    """
+    Background task: fill freed seats from the waitlists of these activities.
+
+    Calls that arrive while a promotion run is active only queue their
+    activities; the running task picks them up in its next batch.
+    """
+    global _promoting
+    _pending_promotions.update(activity_ids)
+    if _promoting:
+        return
+
+    _promoting = True
+    try:
+        while _pending_promotions:
+            batch = list(_pending_promotions)
+            _pending_promotions.clear()
+            async with get_db_context() as db:
+                for activity_id in batch:
+                    promoted = await _promote_activity(activity_id, db)
+                    if promoted:
+                        logger.info("Promoted %s guests from the waitlist of activity %s", promoted, activity_id)
+    except Exception:
+        logger.exception("Waitlist promotion failed")
+    finally:
+        _promoting = False
@@ -1,17 +1,13 @@
 import logging
 
-from groq import Groq
 from app.config import settings
+from app.services.groq_client import get_groq_client
+from app.utils.metrics import track_llm_call
+from app.utils.tracing import span
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-client = None
-if settings.GROQ_API_KEY:
-    client = Groq(api_key=settings.GROQ_API_KEY)
-else:
-    logger.warning("GROQ_API_KEY is not set. AI chat will not work.")
-
 SYSTEM_PROMPT = """You are a helpful AI assistant for a Wedding Guest Management Portal. You help guests and wedding administrators with:
 
 1. WEDDING-RELATED QUESTIONS:
@@ -65,6 +61,7 @@ async def get_chat_response(
     # Add current message
     messages.append({"role": "user", "content": message})
 
+    client = get_groq_client()
     if not client:
         logger.error("Groq client not initialized - GROQ_API_KEY is missing")
         return (
@@ -73,13 +70,14 @@ async def get_chat_response(
         )
 
     try:
-        response = client.chat.completions.create(
-            model=settings.GROQ_MODEL,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1024,
-            top_p=0.9,
-        )
+        with track_llm_call("ai_chat"), span("llm.ai_chat", **{"llm.model": settings.GROQ_MODEL}):
+            response = client.chat.completions.create(
+                model=settings.GROQ_MODEL,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1024,
+                top_p=0.9,
+            )
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"Groq API error ({type(e).__name__}): {e}")
@@ -111,6 +109,7 @@ async def get_streaming_response(
 
     messages.append({"role": "user", "content": message})
 
+    client = get_groq_client()
     if not client:
         yield "AI assistant is not configured. Please contact the wedding organizers."
         return
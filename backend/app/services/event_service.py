@@ -1,12 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload, selectinload
 from typing import Optional
 from uuid import UUID
 
 from app.models.event import Event
 from app.models.invitation import Invitation
-from app.models.guest import RSVPStatus
+from app.models.guest import Guest, RSVPStatus
 from app.schemas.event import EventCreate, EventUpdate
 
 
@@ -39,7 +39,9 @@ class EventService:
         event_type: Optional[str] = None
     ) -> list[Event]:
         """Get all events with optional filters."""
-        query = select(Event).options(selectinload(Event.invitations))
+        # Event.invitations is selectin by default; the listing only needs
+        # counts, which get_events_stats() computes
+        query = select(Event).options(noload(Event.invitations))
 
         filters = []
         if is_active is not None:
@@ -80,35 +82,35 @@ class EventService:
         )
         return result.rowcount > 0
 
-    async def get_event_stats(self, event_id: UUID) -> dict:
-        """Get statistics for an event."""
-        # Get invitation count
-        invitation_result = await self.db.execute(
-            select(func.count(Invitation.id))
-            .where(Invitation.event_id == event_id)
-        )
-        total_invitations = invitation_result.scalar()
+    async def get_events_stats(self, event_ids: list[UUID]) -> dict[UUID, dict]:
+        """Get statistics for several events in one grouped query."""
+        stats = {
+            event_id: {"total_invitations": 0, "sent_invitations": 0, "confirmed_guests": 0}
+            for event_id in event_ids
+        }
+        if not event_ids:
+            return stats
 
-        # Get sent invitations count
-        sent_result = await self.db.execute(
-            select(func.count(Invitation.id))
-            .where(Invitation.event_id == event_id)
-            .where(Invitation.is_sent == True)
-        )
-        sent_invitations = sent_result.scalar()
-
-        # Get confirmed guests for this event through invitations
-        from app.models.guest import Guest
-        confirmed_result = await self.db.execute(
-            select(func.count(Guest.id))
-            .join(Invitation, Guest.id == Invitation.guest_id)
-            .where(Invitation.event_id == event_id)
-            .where(Guest.rsvp_status == RSVPStatus.CONFIRMED)
+        result = await self.db.execute(
+            select(
+                Invitation.event_id,
+                func.count(Invitation.id),
+                func.count(Invitation.id).filter(Invitation.is_sent == True),
+                func.count(Invitation.id).filter(Guest.rsvp_status == RSVPStatus.confirmed)
+            )
+            .join(Guest, Guest.id == Invitation.guest_id)
+            .where(Invitation.event_id.in_(event_ids))
+            .group_by(Invitation.event_id)
         )
-        confirmed_guests = confirmed_result.scalar()
+        for event_id, total, sent, confirmed in result.all():
+            stats[event_id] = {
+                "total_invitations": total,
+                "sent_invitations": sent,
+                "confirmed_guests": confirmed
+            }
+        return stats
 
-        return {
-            "total_invitations": total_invitations,
-            "sent_invitations": sent_invitations,
-            "confirmed_guests": confirmed_guests
-        }
+    async def get_event_stats(self, event_id: UUID) -> dict:
+        """Get statistics for an event."""
+        stats = await self.get_events_stats([event_id])
+        return stats[event_id]
@@ -0,0 +1,29 @@
+"""
+Shared Groq client for the AI chat and Rada chatbot services.
+
+The SDK is imported and the client built on first use, so workers that
+never serve a chat request don't pay for it at startup.
+"""
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from groq import Groq
+
+logger = logging.getLogger(__name__)
+
+if not settings.GROQ_API_KEY:
+    logger.warning("GROQ_API_KEY is not set. AI chat and the Rada chatbot will not work.")
+
+_client: Optional["Groq"] = None
+
+
+def get_groq_client() -> Optional["Groq"]:
+    """Return the process-wide Groq client, or None if no API key is configured."""
+    global _client
+    if _client is None and settings.GROQ_API_KEY:
+        from groq import Groq
+        _client = Groq(api_key=settings.GROQ_API_KEY)
+    return _client
@@ -1,13 +1,25 @@
+"""
+Guest portal services.
+
+Guest tokens resolve through a per-worker cache. Admin changes that retire
+a token (deleting the guest, regenerating the link) clear it only in the
+worker that handled them, once the change commits; other gunicorn workers
+keep serving the old resolution for up to GUEST_TOKEN_CACHE_TTL_SECONDS,
+which is kept to a few seconds for that reason.
+"""
 import os
+import time
 import uuid as uuid_lib
 import aiofiles
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
 from datetime import datetime
 from uuid import UUID
 from fastapi import UploadFile, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
 
 from app.models import (
     Guest, Wedding, TravelInfo, HotelInfo, SuggestedHotel,
@@ -15,34 +27,228 @@ from app.models import (
     Activity, GuestActivity, MediaUpload, FileType
 )
 from app.config import settings
+from app.services.activity_service import adjust_reservations
+from app.utils.cache import TTLCache
+from app.utils.metrics import record_upload
+from app.utils.tracing import span
 
 
-async def get_guest_by_token(
+@dataclass(frozen=True)
+class GuestIdentity:
+    """Who a guest token belongs to; enough for endpoints that only scope by ids."""
+    id: UUID
+    wedding_id: UUID
+
+
+# Marks tokens known not to exist, so scanners and stale links skip the DB.
+_UNKNOWN_TOKEN = object()
+
+_guest_token_cache: TTLCache[Union[GuestIdentity, object]] = TTLCache(
+    maxsize=settings.GUEST_TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.GUEST_TOKEN_CACHE_TTL_SECONDS
+)
+# Guest ids whose last_accessed_at was written recently; throttles that write.
+_recently_accessed: TTLCache[bool] = TTLCache(
+    maxsize=settings.GUEST_TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.GUEST_LAST_ACCESSED_RESOLUTION_SECONDS
+)
+
+
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Invalid guest token"
+    )
+
+
+def invalidate_guest_token(*tokens: Optional[str]) -> None:
+    """
+    Forget cached resolutions, e.g. after a link is regenerated or a guest
+    deleted. Call after commit (see ``run_after_commit``), otherwise a
+    concurrent request can cache the old row again.
+    """
+    for token in tokens:
+        if token:
+            _guest_token_cache.pop(token)
+
+
+def _remember_guest_token(token: str, identity: Optional[GuestIdentity]) -> None:
+    if identity is None:
+        _guest_token_cache.set(
+            token, _UNKNOWN_TOKEN, ttl=settings.GUEST_TOKEN_NEGATIVE_TTL_SECONDS
+        )
+    else:
+        _guest_token_cache.set(token, identity)
+
+
+async def touch_last_accessed(guest_id: UUID, db: AsyncSession) -> None:
+    """Record a portal visit, at most once per resolution window per guest."""
+    if _recently_accessed.get(guest_id):
+        return
+    await db.execute(
+        update(Guest).where(Guest.id == guest_id).values(last_accessed_at=datetime.utcnow())
+    )
+    _recently_accessed.set(guest_id, True)
+
+
+async def resolve_guest_token(
     token: str,
     db: AsyncSession,
     update_last_accessed: bool = True
+) -> GuestIdentity:
+    """
+    Resolve a guest token to its (guest id, wedding id) without loading the
+    guest row. Served from the token cache; unknown tokens are cached too.
+    """
+    identity = _guest_token_cache.get(token)
+
+    if identity is None:
+        result = await db.execute(
+            select(Guest.id, Guest.wedding_id).where(Guest.unique_token == token)
+        )
+        row = result.one_or_none()
+        identity = GuestIdentity(id=row.id, wedding_id=row.wedding_id) if row else None
+        _remember_guest_token(token, identity)
+
+    if identity is None or identity is _UNKNOWN_TOKEN:
+        raise _invalid_token()
+
+    if update_last_accessed:
+        await touch_last_accessed(identity.id, db)
+
+    return identity
+
+
+async def get_guest_by_token(
+    token: str,
+    db: AsyncSession,
+    update_last_accessed: bool = True,
+    load_wedding: bool = False
 ) -> Guest:
     """Fetch guest by unique token with validation."""
-    result = await db.execute(
-        select(Guest)
-        .options(selectinload(Guest.wedding))
-        .where(Guest.unique_token == token)
-    )
+    if _guest_token_cache.get(token) is _UNKNOWN_TOKEN:
+        raise _invalid_token()
+
+    query = select(Guest).where(Guest.unique_token == token)
+    if load_wedding:
+        query = query.options(joinedload(Guest.wedding))
+    result = await db.execute(query)
     guest = result.scalar_one_or_none()
 
     if not guest:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Invalid guest token"
-        )
+        _remember_guest_token(token, None)
+        raise _invalid_token()
+
+    _remember_guest_token(token, GuestIdentity(id=guest.id, wedding_id=guest.wedding_id))
 
     if update_last_accessed:
         guest.last_accessed_at = datetime.utcnow()
         await db.flush()
+        _recently_accessed.set(guest.id, True)
 
     return guest
 
 
+async def sync_activity_registrations(
+    guest_id: UUID,
+    wedding_id: UUID,
+    activity_ids: list[str],
+    participants: int,
+    db: AsyncSession
+) -> set[UUID]:
+    """
+    Make the guest's activity registrations match activity_ids.
+
+    Works as a set diff in a fixed number of statements: registrations that
+    stay selected keep their row and registered_at, removed ones are deleted
+    and new ones inserted, and the seat counters move by the difference.
+    Ids that are malformed or belong to another wedding are ignored; a full
+    activity rejects the whole update. The guest row is locked first, so
+    concurrent syncs for the same guest (double submits) run one after the
+    other and each diffs against the registrations the previous one left.
+
+    Returns the activities that gained free seats, for waitlist promotion.
+    """
+    requested = set()
+    for activity_id in activity_ids:
+        try:
+            requested.add(UUID(activity_id))
+        except ValueError:
+            continue
+
+    selected: set[UUID] = set()
+    if requested:
+        result = await db.execute(
+            select(Activity.id).where(
+                Activity.id.in_(requested),
+                Activity.wedding_id == wedding_id
+            )
+        )
+        selected = set(result.scalars().all())
+
+    await db.execute(select(Guest.id).where(Guest.id == guest_id).with_for_update())
+    existing_result = await db.execute(
+        select(GuestActivity.activity_id, GuestActivity.number_of_participants)
+        .where(GuestActivity.guest_id == guest_id)
+        .with_for_update()
+    )
+    existing = dict(existing_result.all())
+
+    removed = set(existing) - selected
+    added = selected - set(existing)
+    resized = {a for a in selected & set(existing) if existing[a] != participants}
+
+    seat_changes = {a: -(existing[a] or 0) for a in removed}
+    seat_changes.update({a: participants for a in added})
+    seat_changes.update({a: participants - (existing[a] or 0) for a in resized})
+    full = await adjust_reservations(seat_changes, db)
+    if full:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One or more selected activities are full"
+        )
+
+    if removed:
+        await db.execute(
+            delete(GuestActivity).where(
+                GuestActivity.guest_id == guest_id,
+                GuestActivity.activity_id.in_(removed)
+            ),
+            execution_options={"synchronize_session": False}
+        )
+
+    # Kept registrations follow the party size without being recreated
+    if resized:
+        await db.execute(
+            update(GuestActivity)
+            .where(
+                GuestActivity.guest_id == guest_id,
+                GuestActivity.activity_id.in_(resized)
+            )
+            .values(number_of_participants=participants),
+            execution_options={"synchronize_session": False}
+        )
+
+    if added:
+        now = datetime.utcnow()
+        await db.execute(
+            insert(GuestActivity)
+            .values([
+                {
+                    "id": uuid_lib.uuid4(),
+                    "guest_id": guest_id,
+                    "activity_id": activity_id,
+                    "number_of_participants": participants,
+                    "registered_at": now,
+                }
+                for activity_id in added
+            ])
+            .on_conflict_do_nothing(constraint="uq_guest_activity")
+        )
+
+    return {a for a, change in seat_changes.items() if change < 0}
+
+
 async def get_complete_portal_data(guest: Guest, db: AsyncSession) -> dict:
     """Aggregate all data for guest portal view."""
     wedding_id = guest.wedding_id
@@ -122,58 +328,60 @@ async def get_complete_portal_data(guest: Guest, db: AsyncSession) -> dict:
     )
     media_uploads = media_result.scalars().all()
 
-    return {
-        "guest": {
-            "id": str(guest.id),
-            "full_name": guest.full_name,
-            "email": guest.email,
-            "phone": guest.phone,
-            "country": guest.country_of_origin,
-            "rsvp_status": guest.rsvp_status.value if guest.rsvp_status else None,
-            "number_of_attendees": guest.number_of_attendees,
-            "special_requests": guest.special_requests,
-            "song_requests": guest.song_requests,
-            "notes_to_couple": guest.notes_to_couple,
-            "party_members": guest.party_members,
-        },
-        "wedding": {
-            "id": str(wedding.id),
-            "couple_names": wedding.couple_names,
-            "wedding_date": wedding.wedding_date.isoformat() if wedding.wedding_date else None,
-            "venue_name": wedding.venue_name,
-            "venue_address": wedding.venue_address,
-            "venue_city": wedding.venue_city,
-            "venue_country": wedding.venue_country,
-            "welcome_message": wedding.welcome_message,
-            "cover_image_url": wedding.cover_image_url,
-            "story_title": wedding.story_title,
-            "story_content": wedding.story_content,
-            "story_image_url": wedding.story_image_url,
-        },
-        "travel_info": _serialize_travel_info(travel_info) if travel_info else None,
-        "hotel_info": _serialize_hotel_info(hotel_info) if hotel_info else None,
-        "suggested_hotels": [_serialize_suggested_hotel(h) for h in suggested_hotels],
-        "dress_codes": [
-            {
-                **_serialize_dress_code(dc),
-                "guest_preference": _serialize_dress_preference(dress_preferences.get(dc.id))
-                if dc.id in dress_preferences else None
-            }
-            for dc in dress_codes
-        ],
-        "food_menus": [_serialize_food_menu(fm) for fm in food_menus],
-        "food_preference": _serialize_food_preference(food_preference) if food_preference else None,
-        "activities": [
-            {
-                **_serialize_activity(a),
-                "is_registered": a.id in activity_registrations,
-                "registration": _serialize_activity_registration(activity_registrations.get(a.id))
-                if a.id in activity_registrations else None
-            }
-            for a in activities
-        ],
-        "media_uploads": [_serialize_media_upload(m) for m in media_uploads]
-    }
+    with span("serialize.portal"):
+        portal = {
+            "guest": {
+                "id": str(guest.id),
+                "full_name": guest.full_name,
+                "email": guest.email,
+                "phone": guest.phone,
+                "country": guest.country_of_origin,
+                "rsvp_status": guest.rsvp_status.value if guest.rsvp_status else None,
+                "number_of_attendees": guest.number_of_attendees,
+                "special_requests": guest.special_requests,
+                "song_requests": guest.song_requests,
+                "notes_to_couple": guest.notes_to_couple,
+                "party_members": guest.party_members,
+            },
+            "wedding": {
+                "id": str(wedding.id),
+                "couple_names": wedding.couple_names,
+                "wedding_date": wedding.wedding_date.isoformat() if wedding.wedding_date else None,
+                "venue_name": wedding.venue_name,
+                "venue_address": wedding.venue_address,
+                "venue_city": wedding.venue_city,
+                "venue_country": wedding.venue_country,
+                "welcome_message": wedding.welcome_message,
+                "cover_image_url": wedding.cover_image_url,
+                "story_title": wedding.story_title,
+                "story_content": wedding.story_content,
+                "story_image_url": wedding.story_image_url,
+            },
+            "travel_info": _serialize_travel_info(travel_info) if travel_info else None,
+            "hotel_info": _serialize_hotel_info(hotel_info) if hotel_info else None,
+            "suggested_hotels": [_serialize_suggested_hotel(h) for h in suggested_hotels],
+            "dress_codes": [
+                {
+                    **_serialize_dress_code(dc),
+                    "guest_preference": _serialize_dress_preference(dress_preferences.get(dc.id))
+                    if dc.id in dress_preferences else None
+                }
+                for dc in dress_codes
+            ],
+            "food_menus": [_serialize_food_menu(fm) for fm in food_menus],
+            "food_preference": _serialize_food_preference(food_preference) if food_preference else None,
+            "activities": [
+                {
+                    **_serialize_activity(a),
+                    "is_registered": a.id in activity_registrations,
+                    "registration": _serialize_activity_registration(activity_registrations.get(a.id))
+                    if a.id in activity_registrations else None
+                }
+                for a in activities
+            ],
+            "media_uploads": [_serialize_media_upload(m) for m in media_uploads]
+        }
+    return portal
 
 
 def _serialize_travel_info(ti: TravelInfo) -> dict:
@@ -382,6 +590,7 @@ async def validate_and_save_file(
         )
 
     # Read file content
+    started = time.perf_counter()
     content = await file.read()
     file_size = len(content)
 
@@ -408,8 +617,11 @@ async def validate_and_save_file(
     file_path = os.path.join(upload_dir, unique_filename)
 
     # Save file
-    async with aiofiles.open(file_path, "wb") as f:
-        await f.write(content)
+    with span("file.write", **{"file.size": file_size, "file.kind": file_type.value}):
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(content)
+
+    record_upload(file_type.value, file_size, time.perf_counter() - started)
 
     # Generate URL path
     file_url = f"/uploads/weddings/{wedding_id}/guest-media/{guest_id}/{unique_filename}"
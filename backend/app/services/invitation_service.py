@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete, update
+from sqlalchemy import String, any_, column, delete, false, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from typing import Optional
 from uuid import UUID
@@ -9,7 +11,22 @@ from app.models.invitation import Invitation
 from app.models.guest import Guest
 from app.models.event import Event
 from app.schemas.invitation import InvitationCreate, InvitationUpdate, BulkInvitationCreate
-from app.utils.helpers import generate_invitation_code
+from app.utils.exceptions import ConflictException, NotFoundException
+from app.utils.helpers import generate_invitation_codes, normalize_invitation_code
+
+# Rounds of code generation (and of bulk inserts) before giving up on code collisions
+CODE_ATTEMPTS = 3
+
+# Constraints whose violations are told apart when an insert fails
+CODE_INDEX = "uq_invitations_invitation_code_upper"
+GUEST_EVENT_CONSTRAINT = "uq_invitations_guest_id_event_id"
+EVENT_FOREIGN_KEY = "fk_invitations_event_id_events"
+GUEST_FOREIGN_KEY = "fk_invitations_guest_id_guests"
+
+
+def _violated_constraint(exc: IntegrityError) -> Optional[str]:
+    """Name of the constraint behind an asyncpg IntegrityError, if reported."""
+    return getattr(getattr(exc.orig, "__cause__", None), "constraint_name", None)
 
 
 class InvitationService:
@@ -18,14 +35,40 @@ class InvitationService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def _unused_invitation_codes(self, count: int) -> list[str]:
+        """Pre-generate ``count`` codes, regenerating any already taken."""
+        codes: set[str] = set()
+        for _ in range(CODE_ATTEMPTS):
+            candidates = generate_invitation_codes(count - len(codes)) - codes
+            taken = await self.db.execute(
+                select(func.upper(Invitation.invitation_code))
+                .where(func.upper(Invitation.invitation_code) == any_(literal(list(candidates), ARRAY(String))))
+            )
+            codes |= candidates - set(taken.scalars().all())
+            if len(codes) >= count:
+                return list(codes)[:count]
+        raise RuntimeError("Could not generate unique invitation codes")
+
     async def create_invitation(self, data: InvitationCreate) -> Invitation:
         """Create a new invitation."""
+        codes = await self._unused_invitation_codes(1)
         invitation = Invitation(
             **data.model_dump(),
-            invitation_code=generate_invitation_code()
+            invitation_code=codes[0]
         )
-        self.db.add(invitation)
-        await self.db.flush()
+        try:
+            async with self.db.begin_nested():
+                self.db.add(invitation)
+                await self.db.flush()
+        except IntegrityError as exc:
+            constraint = _violated_constraint(exc)
+            if constraint == GUEST_EVENT_CONSTRAINT:
+                raise ConflictException(detail="Guest is already invited to this event")
+            if constraint == EVENT_FOREIGN_KEY:
+                raise NotFoundException("Event", data.event_id)
+            if constraint == GUEST_FOREIGN_KEY:
+                raise NotFoundException("Guest", data.guest_id)
+            raise
         await self.db.refresh(invitation)
         return invitation
 
@@ -49,7 +92,7 @@ class InvitationService:
                 selectinload(Invitation.guest),
                 selectinload(Invitation.event)
             )
-            .where(Invitation.invitation_code == code.upper())
+            .where(func.upper(Invitation.invitation_code) == normalize_invitation_code(code))
         )
         return result.scalar_one_or_none()
 
@@ -118,32 +161,70 @@ class InvitationService:
     async def bulk_create_invitations(
         self,
         data: BulkInvitationCreate
-    ) -> list[Invitation]:
-        """Bulk create invitations for multiple guests to an event."""
-        invitations = []
-        for guest_id in data.guest_ids:
-            # Check if invitation already exists
-            existing = await self.db.execute(
-                select(Invitation)
-                .where(Invitation.guest_id == guest_id)
-                .where(Invitation.event_id == data.event_id)
-            )
-            if existing.scalar_one_or_none():
-                continue  # Skip if already exists
+    ) -> list[UUID]:
+        """
+        Bulk create invitations for multiple guests to an event.
 
-            invitation = Invitation(
-                guest_id=guest_id,
-                event_id=data.event_id,
-                invitation_code=generate_invitation_code()
+        Codes are pre-generated in one batch and checked against the table,
+        then a single INSERT ... SELECT FROM unnest(guest_ids, codes) creates
+        the missing invitations; guests that already have one, or do not
+        exist, are skipped. Returns the ids of the new invitations.
+        """
+        now = datetime.utcnow()
+        guest_ids = list(dict.fromkeys(data.guest_ids))
+        if not guest_ids:
+            return []
+
+        # ON CONFLICT only covers (guest_id, event_id), so a code taken
+        # concurrently fails the INSERT on CODE_INDEX; roll back to the
+        # savepoint and retry with new codes. Other violations are not retried
+        for attempt in range(CODE_ATTEMPTS):
+            codes = await self._unused_invitation_codes(len(guest_ids))
+            new = func.unnest(
+                literal(guest_ids, ARRAY(PGUUID(as_uuid=True))),
+                literal(codes, ARRAY(String))
+            ).table_valued(
+                column("guest_id", PGUUID(as_uuid=True)),
+                column("code", String)
+            ).render_derived(name="new")
+            rows = (
+                select(
+                    func.gen_random_uuid(),
+                    new.c.guest_id,
+                    literal(data.event_id, PGUUID(as_uuid=True)),
+                    new.c.code,
+                    false(),
+                    false(),
+                    false(),
+                    literal(now),
+                    literal(now)
+                )
+                .join_from(new, Guest, Guest.id == new.c.guest_id)
             )
-            self.db.add(invitation)
-            invitations.append(invitation)
 
-        await self.db.flush()
-        for invitation in invitations:
-            await self.db.refresh(invitation)
+            try:
+                async with self.db.begin_nested():
+                    result = await self.db.execute(
+                        insert(Invitation)
+                        .from_select(
+                            [
+                                "id", "guest_id", "event_id", "invitation_code",
+                                "is_sent", "is_delivered", "is_opened", "created_at", "updated_at"
+                            ],
+                            rows
+                        )
+                        .on_conflict_do_nothing(constraint=GUEST_EVENT_CONSTRAINT)
+                        .returning(Invitation.id)
+                    )
+                    return list(result.scalars().all())
+            except IntegrityError as exc:
+                constraint = _violated_constraint(exc)
+                if constraint == EVENT_FOREIGN_KEY:
+                    raise NotFoundException("Event", data.event_id)
+                if constraint != CODE_INDEX or attempt == CODE_ATTEMPTS - 1:
+                    raise
 
-        return invitations
+        return []
 
     async def mark_invitations_sent(
         self,
@@ -153,12 +234,13 @@ class InvitationService:
         """Mark multiple invitations as sent."""
         result = await self.db.execute(
             update(Invitation)
-            .where(Invitation.id.in_(invitation_ids))
+            .where(Invitation.id == any_(literal(invitation_ids, ARRAY(PGUUID(as_uuid=True)))))
             .values(
                 is_sent=True,
                 sent_date=datetime.utcnow(),
                 sent_method=sent_method
-            )
+            ),
+            execution_options={"synchronize_session": False}
         )
         return result.rowcount
 
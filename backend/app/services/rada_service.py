@@ -1,14 +1,18 @@
+import asyncio
 import logging
 import uuid
 import re
 from typing import Optional
 from datetime import datetime
 
-from groq import Groq
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
 from app.config import settings
+from app.database import release_connection
+from app.services.groq_client import get_groq_client
+from app.utils.metrics import track_llm_call
+from app.utils.tracing import span
 from app.models import (
     Guest, Wedding, TravelInfo, HotelInfo, SuggestedHotel,
     Activity, GuestActivity
@@ -18,13 +22,6 @@ from app.models.chatbot_log import ChatbotLog
 
 logger = logging.getLogger(__name__)
 
-client = None
-if settings.GROQ_API_KEY:
-    client = Groq(api_key=settings.GROQ_API_KEY)
-else:
-    logger.warning("GROQ_API_KEY is not set. Rada chatbot will not work.")
-
-
 # Topic keywords for detection
 TOPIC_KEYWORDS = {
     "rsvp": ["rsvp", "confirm", "attend", "coming", "decline", "response", "حضور", "تأكيد"],
@@ -242,6 +239,7 @@ async def chat(
 ) -> dict:
     """Process a chat message and return the response."""
 
+    client = get_groq_client()
     if not client:
         fallback = (
             "I'm sorry, but the AI assistant is not configured yet. "
@@ -293,15 +291,20 @@ async def chat(
     # Detect topic
     topic = detect_topic(message)
 
+    # Don't hold a pooled connection while waiting on the model
+    await release_connection(db)
+
     # Call Groq
     try:
-        response = client.chat.completions.create(
-            model=settings.GROQ_MODEL,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1024,
-            top_p=0.9,
-        )
+        with track_llm_call("rada_chat"), span("llm.rada_chat", **{"llm.model": settings.GROQ_MODEL}):
+            response = await asyncio.to_thread(
+                client.chat.completions.create,
+                model=settings.GROQ_MODEL,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1024,
+                top_p=0.9,
+            )
         bot_response = response.choices[0].message.content
     except Exception as e:
         logger.error(f"Groq API error: {e}")
@@ -0,0 +1,20 @@
+"""
+Pytest helpers. Enable in a conftest.py with::
+
+    pytest_plugins = ["app.testing"]
+
+then assert per-endpoint query counts::
+
+    async def test_portal_queries(client, assert_max_queries):
+        with assert_max_queries(12, repeat_threshold=3):
+            await client.get(f"/api/guest/{token}")
+"""
+import pytest
+
+from app.utils.query_stats import assert_max_queries as _assert_max_queries
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Context manager failing the test when the block exceeds a query budget."""
+    return _assert_max_queries
@@ -6,6 +6,8 @@ from app.utils.security import (
 )
 from app.utils.helpers import (
     generate_invitation_code,
+    generate_invitation_codes,
+    normalize_invitation_code,
     format_phone_number,
     export_guests_to_excel,
     import_guests_from_excel
@@ -42,6 +44,8 @@ __all__ = [
     "decode_token",
     # Helpers
     "generate_invitation_code",
+    "generate_invitation_codes",
+    "normalize_invitation_code",
     "format_phone_number",
     "export_guests_to_excel",
     "import_guests_from_excel",
@@ -1,8 +1,12 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 import hashlib
 import secrets
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -13,11 +17,50 @@ from sqlalchemy import select
 from app.config import settings
 from app.database import get_db
 from app.models import Wedding
+from app.utils.cache import TTLCache
 
 security = HTTPBearer()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@dataclass(frozen=True)
+class WeddingPrincipal:
+    """Authenticated wedding identity; immutable so it can be shared across requests."""
+    id: UUID
+    is_active: bool
+
+
+# Verified bearer token -> principal, so repeat admin calls skip both the
+# JWT signature check and the weddings lookup until the entry expires. The
+# cache is per worker: a deactivation or password change clears it only in
+# the worker that made it, and other workers keep accepting the old
+# principal for up to AUTH_CACHE_TTL_SECONDS.
+_principal_cache: TTLCache[WeddingPrincipal] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+# bcrypt releases the GIL, so a small thread pool moves hashing off the event
+# loop; the pool size caps how many hashes run at once in each worker.
+# Created on first use so a new app lifespan works after a shutdown.
+_password_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
+
+def _is_bcrypt_hash(hashed_password: str) -> bool:
+    return hashed_password.startswith('$2b$') or hashed_password.startswith('$2a$')
+
+
 def hash_password(password: str) -> str:
     """Hash password using bcrypt."""
     return pwd_context.hash(password)
@@ -26,7 +69,7 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash. Supports both bcrypt and legacy SHA256."""
     # Support bcrypt hashes (start with $2b$)
-    if hashed_password.startswith('$2b$') or hashed_password.startswith('$2a$'):
+    if _is_bcrypt_hash(hashed_password):
         return pwd_context.verify(plain_password, hashed_password)
     # Fallback: support legacy SHA256 hashes for existing users
     try:
@@ -37,6 +80,36 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy SHA256 hashes and bcrypt hashes below the current cost."""
+    if not _is_bcrypt_hash(hashed_password):
+        return True
+    return pwd_context.needs_update(hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the password executor, keeping the event loop free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password executor; legacy SHA256 checks run inline."""
+    if not _is_bcrypt_hash(hashed_password):
+        return verify_password(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_executor(), verify_password, plain_password, hashed_password
+    )
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=True)
+        _password_executor = None
+
+
 def create_access_token(wedding_id: UUID, expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -52,23 +125,97 @@ def create_access_token(wedding_id: UUID, expires_delta: Optional[timedelta] = N
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[UUID]:
+def _decode_access_payload(token: str) -> Optional[dict[str, Any]]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        wedding_id: str = payload.get("sub")
-        if wedding_id is None:
+        if payload.get("sub") is None:
             return None
-        return UUID(wedding_id)
+        return payload
     except JWTError:
         return None
 
 
+def decode_access_token(token: str) -> Optional[UUID]:
+    payload = _decode_access_payload(token)
+    if payload is None:
+        return None
+    try:
+        return UUID(payload["sub"])
+    except ValueError:
+        return None
+
+
+def invalidate_wedding_principal(wedding_id: UUID) -> None:
+    """
+    Drop cached principals for a wedding after a password or status change.
+    Call after commit (see ``run_after_commit``), otherwise a concurrent
+    request can cache the old principal again.
+    """
+    _principal_cache.discard_where(lambda _, principal: principal.id == wedding_id)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> WeddingPrincipal:
+    """
+    Lightweight admin dependency for routes that only need the wedding id.
+    Served from the principal cache; falls back to JWT decode plus an
+    id/is_active lookup on a miss. Deactivation reaches other workers only
+    when their cache entry expires, after at most AUTH_CACHE_TTL_SECONDS.
+    """
+    token = credentials.credentials
+    principal = _principal_cache.get(token)
+
+    if principal is None:
+        payload = _decode_access_payload(token)
+        try:
+            wedding_id = UUID(payload["sub"]) if payload else None
+        except ValueError:
+            wedding_id = None
+
+        if wedding_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+
+        result = await db.execute(
+            select(Wedding.id, Wedding.is_active).where(Wedding.id == wedding_id)
+        )
+        row = result.one_or_none()
+
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Wedding not found",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+
+        principal = WeddingPrincipal(id=row.id, is_active=bool(row.is_active))
+        # Never cache past the token's own expiry
+        ttl = settings.AUTH_CACHE_TTL_SECONDS
+        if payload.get("exp") is not None:
+            ttl = min(ttl, payload["exp"] - time.time())
+        _principal_cache.set(token, principal, ttl=ttl)
+
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Wedding account is deactivated"
+        )
+
+    return principal
+
+
 async def get_current_wedding(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ) -> Wedding:
     token = credentials.credentials
-    wedding_id = decode_access_token(token)
+    principal = _principal_cache.get(token)
+    wedding_id = principal.id if principal else decode_access_token(token)
 
     if wedding_id is None:
         raise HTTPException(
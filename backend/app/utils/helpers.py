@@ -1,15 +1,31 @@
-import uuid
 import re
+import secrets
 from typing import Optional, BinaryIO
 from io import BytesIO
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 
 
-def generate_invitation_code(length: int = 8) -> str:
-    """Generate a unique invitation code."""
-    return str(uuid.uuid4())[:length].upper()
+# Crockford base32: no I, L, O or U, so codes survive being read aloud or retyped
+INVITATION_CODE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+INVITATION_CODE_LENGTH = 10  # 50 bits
+_CODE_LOOKALIKES = str.maketrans({"I": "1", "L": "1", "O": "0", "-": None, " ": None})
+
+
+def generate_invitation_code(length: int = INVITATION_CODE_LENGTH) -> str:
+    """Generate a random invitation code."""
+    return "".join(secrets.choice(INVITATION_CODE_ALPHABET) for _ in range(length))
+
+
+def generate_invitation_codes(count: int, length: int = INVITATION_CODE_LENGTH) -> set[str]:
+    """Generate ``count`` distinct invitation codes."""
+    codes: set[str] = set()
+    while len(codes) < count:
+        codes.add(generate_invitation_code(length))
+    return codes
+
+
+def normalize_invitation_code(code: str) -> str:
+    """Canonical form of a typed code: upper case, no separators, lookalikes mapped."""
+    return code.strip().upper().translate(_CODE_LOOKALIKES)
 
 
 def format_phone_number(phone: Optional[str]) -> Optional[str]:
@@ -24,6 +40,9 @@ def format_phone_number(phone: Optional[str]) -> Optional[str]:
 
 def export_guests_to_excel(guests: list[dict]) -> BytesIO:
     """Export guests to Excel file."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Guests"
@@ -99,6 +118,8 @@ def export_guests_to_excel(guests: list[dict]) -> BytesIO:
 
 def import_guests_from_excel(file: BinaryIO) -> list[dict]:
     """Import guests from Excel file."""
+    import pandas as pd
+
     df = pd.read_excel(file)
 
     # Normalize column names
@@ -140,6 +161,9 @@ def import_guests_from_excel(file: BinaryIO) -> list[dict]:
 
 def generate_guest_template() -> BytesIO:
     """Generate an Excel template for importing guests."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Guest Template"
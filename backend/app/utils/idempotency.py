@@ -0,0 +1,231 @@
+"""
+Idempotency-Key support for retry-prone guest writes.
+
+Routes marked ``@idempotent`` keep their response for
+IDEMPOTENCY_TTL_SECONDS under the client's Idempotency-Key, scoped to the
+method and path (which carries the guest token). A retry with the same key
+replays the stored response without running the endpoint again. A retry
+that arrives while the first attempt is still running gets 409, and reusing
+a key for a different request body gets 422. 5xx responses are not kept,
+so those can be retried for real.
+"""
+import hashlib
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Optional, TypeVar
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import IdempotencyKey
+from app.utils.exceptions import create_error_response
+from app.utils.routing import match_route
+
+F = TypeVar("F", bound=Callable)
+
+MAX_KEY_LENGTH = 255
+# How long a crashed first attempt can block retries of the same key
+IN_PROGRESS_SECONDS = 300
+# Share of claims that also sweep expired keys
+PURGE_PROBABILITY = 0.01
+# Bodies are buffered here before the endpoint's own upload size check runs;
+# allow MAX_UPLOAD_SIZE plus room for the multipart framing and form fields
+MAX_BODY_SIZE = settings.MAX_UPLOAD_SIZE + 64 * 1024
+
+
+def idempotent(func: F) -> F:
+    """Honour the Idempotency-Key header on this route."""
+    func.__idempotent__ = True
+    return func
+
+
+def _fingerprint(headers: Headers, body: bytes) -> str:
+    # Clients pick a new multipart boundary on every resubmit; leave it out
+    # so a retried upload of the same form matches the original
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("multipart/"):
+        _, _, boundary = content_type.partition("boundary=")
+        boundary = boundary.split(";")[0].strip().strip('"')
+        if boundary:
+            body = body.replace(boundary.encode("latin-1"), b"")
+    return hashlib.sha256(body).hexdigest()
+
+
+def _error(status_code: int, detail: str, error_code: str) -> Response:
+    return JSONResponse(
+        status_code=status_code,
+        content=create_error_response(detail=detail, error_code=error_code)
+    )
+
+
+async def _claim(key: str, request_scope: str, fingerprint: str) -> Optional[IdempotencyKey]:
+    """
+    Reserve the key for this request. Returns None when the caller should
+    run the endpoint, otherwise the existing entry.
+    """
+    now = datetime.utcnow()
+    claim = (
+        insert(IdempotencyKey)
+        .values(
+            key=key,
+            request_scope=request_scope,
+            request_fingerprint=fingerprint,
+            expires_at=now + timedelta(seconds=IN_PROGRESS_SECONDS)
+        )
+        .on_conflict_do_nothing(constraint="uq_idempotency_keys_key_request_scope")
+        .returning(IdempotencyKey.id)
+    )
+    async with async_session_maker() as db:
+        if random.random() < PURGE_PROBABILITY:
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+
+        if (await db.execute(claim)).scalar_one_or_none() is not None:
+            await db.commit()
+            return None
+
+        existing = (await db.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_scope == request_scope
+            )
+        )).scalar_one_or_none()
+
+        if existing is None or existing.expires_at <= now:
+            # Expired (or just released): take it over
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.request_scope == request_scope
+                )
+            )
+            claimed = (await db.execute(claim)).scalar_one_or_none() is not None
+            await db.commit()
+            if claimed:
+                return None
+            existing = None
+
+        await db.commit()
+        return existing
+
+
+async def _store(key: str, request_scope: str, message: Message, body: bytes, ttl_seconds: int) -> None:
+    headers = [[name.decode("latin-1"), value.decode("latin-1")] for name, value in message.get("headers", [])]
+    async with async_session_maker() as db:
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.request_scope == request_scope)
+            .values(
+                status_code=message["status"],
+                response_headers=headers,
+                response_body=body,
+                expires_at=datetime.utcnow() + timedelta(seconds=ttl_seconds)
+            )
+        )
+        await db.commit()
+
+
+async def _release(key: str, request_scope: str) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_scope == request_scope
+            )
+        )
+        await db.commit()
+
+
+def _replay(entry: IdempotencyKey) -> Response:
+    response = Response(content=entry.response_body or b"", status_code=entry.status_code)
+    response.raw_headers = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in entry.response_headers or []
+    ] + [(b"idempotent-replayed", b"true")]
+    return response
+
+
+class IdempotencyMiddleware:
+    """Replay stored responses for repeated Idempotency-Keys on @idempotent routes."""
+
+    def __init__(self, app: ASGIApp, ttl_seconds: int):
+        self.app = app
+        self.ttl_seconds = ttl_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH", "DELETE"):
+            await self.app(scope, receive, send)
+            return
+
+        key = Headers(scope=scope).get("idempotency-key")
+        if not key or not getattr(match_route(scope).get("endpoint"), "__idempotent__", False):
+            await self.app(scope, receive, send)
+            return
+
+        if len(key) > MAX_KEY_LENGTH:
+            await _error(400, "Idempotency-Key is too long", "BAD_REQUEST")(scope, receive, send)
+            return
+
+        # Buffer the body so it can be fingerprinted and then handed on
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_SIZE:
+                await _error(413, "Request body is too large", "FILE_TOO_LARGE")(scope, receive, send)
+                return
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+        fingerprint = _fingerprint(Headers(scope=scope), body)
+        request_scope = f"{scope['method']} {scope['path']}"
+
+        existing = await _claim(key, request_scope, fingerprint)
+        if existing is not None:
+            if existing.request_fingerprint != fingerprint:
+                response = _error(422, "Idempotency-Key was already used for a different request", "VALIDATION_ERROR")
+            elif existing.status_code is None:
+                response = _error(409, "A request with this Idempotency-Key is still being processed", "CONFLICT")
+            else:
+                response = _replay(existing)
+            await response(scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Optional[Message] = None
+        response_chunks = []
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            await _release(key, request_scope)
+            raise
+
+        if start is not None and start["status"] < 500:
+            await _store(key, request_scope, start, b"".join(response_chunks), self.ttl_seconds)
+        else:
+            await _release(key, request_scope)
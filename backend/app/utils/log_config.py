@@ -0,0 +1,141 @@
+"""
+Application logging setup.
+
+Loggers hand records to a QueueHandler; a QueueListener thread does the
+formatting (including tracebacks) and the writes, so a request only pays
+for an enqueue. Output is one JSON object per line unless LOG_FORMAT is
+"text". Repeats of the same warning are rate limited so a burst of bot
+traffic cannot flood the log.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.config import settings
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS
+        )
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DuplicateFilter(logging.Filter):
+    """
+    Let through at most ``burst`` identical warnings (same logger and
+    formatted message) every ``window`` seconds; other levels always pass.
+    The next record after a suppressed stretch reports how many were dropped.
+    """
+
+    def __init__(self, window: float, burst: int):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._seen: dict[tuple, list] = {}  # key -> [window_start, emitted, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+
+        key = (record.name, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                if len(self._seen) > 10_000:
+                    self._seen.clear()
+                self._seen[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock prepare() formats the message and traceback in the calling
+    # thread; the queue is in-process, so pass the record through untouched
+    # and let the listener thread do that work.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    """``"sqlalchemy.engine=WARNING,app.tracing=INFO"`` -> {logger: level}."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    """Install the queue-backed pipeline on the root logger (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    handler = _DeferredQueueHandler(queue.SimpleQueue())
+    handler.addFilter(DuplicateFilter(
+        settings.LOG_DUPLICATE_WINDOW_SECONDS, settings.LOG_DUPLICATE_BURST
+    ))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(logging.DEBUG if settings.DEBUG else settings.LOG_LEVEL.upper())
+
+    # Statement logging is for development only
+    if settings.ENVIRONMENT == "production":
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    for name, level in _parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and log synchronously."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        # Records logged after shutdown are written directly, not queued
+        # for a listener that is no longer running
+        logging.getLogger().handlers = list(_listener.handlers)
+        _listener = None
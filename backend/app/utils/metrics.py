@@ -0,0 +1,154 @@
+"""
+Prometheus metrics for the API, exposed on ``/metrics``.
+
+Under gunicorn set PROMETHEUS_MULTIPROC_DIR so every worker writes its
+samples to a shared directory and a scrape of any worker reports all of
+them (gunicorn.conf.py prepares and cleans the directory).
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.query_stats import track_queries
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"]
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served",
+    multiprocess_mode="livesum"
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements executed per request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+)
+DB_QUERY_SECONDS_PER_REQUEST = Histogram(
+    "db_query_seconds_per_request", "Time spent in SQL per request", ["method", "route"]
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool size", ["engine"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["engine"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ["engine"],
+    multiprocess_mode="livesum"
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds", "LLM API call latency", ["operation"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+)
+LLM_CALL_ERRORS = Counter(
+    "llm_call_errors_total", "Failed LLM API calls", ["operation", "error"]
+)
+
+UPLOAD_BYTES = Histogram(
+    "upload_size_bytes", "Size of uploaded files", ["kind"],
+    buckets=(64e3, 256e3, 1e6, 4e6, 10e6, 25e6, 50e6, 100e6)
+)
+UPLOAD_SECONDS = Histogram(
+    "upload_duration_seconds", "Time to read and store an upload", ["kind"]
+)
+
+
+def _route_label(scope: Scope) -> str:
+    # FastAPI stores the matched APIRoute in the scope; using its template
+    # keeps tokens and ids out of the label values.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request, latency and per-request SQL metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                HTTP_IN_FLIGHT.dec()
+                method, route = scope["method"], _route_label(scope)
+                HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+                HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+                DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.count)
+                DB_QUERY_SECONDS_PER_REQUEST.labels(method, route).observe(stats.seconds)
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> None:
+    """Keep the pool gauges current on every checkout and checkin."""
+    pool = engine.sync_engine.pool
+    DB_POOL_SIZE.labels(name).set(pool.size())
+
+    def update(*_) -> None:
+        DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+        DB_POOL_OVERFLOW.labels(name).set(max(0, pool.overflow()))
+
+    event.listen(pool, "checkout", update)
+    event.listen(pool, "checkin", update)
+
+
+@contextmanager
+def track_llm_call(operation: str) -> Iterator[None]:
+    """Time an LLM call and count it as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        LLM_CALL_ERRORS.labels(operation, type(e).__name__).inc()
+        raise
+    finally:
+        LLM_CALL_SECONDS.labels(operation).observe(time.perf_counter() - started)
+
+
+def record_upload(kind: str, size: int, seconds: float) -> None:
+    UPLOAD_BYTES.labels(kind).observe(size)
+    UPLOAD_SECONDS.labels(kind).observe(seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format, merged across workers if needed."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
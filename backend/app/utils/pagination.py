@@ -0,0 +1,52 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors encode the sort key of the last row on a page, ``(timestamp, id)``,
+so the next page can be fetched with a row-value comparison that walks the
+composite index instead of skipping ``OFFSET`` rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = json.dumps([sort_value.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def estimate_row_count(db: AsyncSession, query: Select) -> int:
+    """
+    Estimate the number of rows a query returns from planner statistics.
+    Runs EXPLAIN only, so the cost does not grow with the table size.
+    """
+    sql = query.compile(
+        dialect=db.bind.dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
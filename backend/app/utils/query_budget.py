@@ -0,0 +1,63 @@
+"""
+Query budgets for development and CI.
+
+Routes may declare how many SQL statements they are allowed with
+``@query_budget(n)``; everything else falls back to QUERY_BUDGET_DEFAULT.
+QueryBudgetMiddleware checks each request against its budget and flags
+statement shapes repeated QUERY_REPEAT_THRESHOLD times or more, the usual
+sign of a per-item query inside a loop. Enabled via QUERY_BUDGET_MODE.
+"""
+import logging
+from typing import Callable, Optional, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.query_stats import QueryBudgetExceeded, budget_violations, track_queries
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Declare the maximum number of SQL statements a route may issue."""
+    def decorator(func: F) -> F:
+        func.__query_budget__ = max_queries
+        return func
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """Log, or raise on, requests that exceed their query budget."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_budget: Optional[int],
+        repeat_threshold: Optional[int],
+        raise_on_violation: bool = False
+    ):
+        self.app = app
+        self.default_budget = default_budget
+        self.repeat_threshold = repeat_threshold
+        self.raise_on_violation = raise_on_violation
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(record_statements=True) as stats:
+            await self.app(scope, receive, send)
+
+        endpoint = scope.get("endpoint")
+        budget = getattr(endpoint, "__query_budget__", self.default_budget)
+        problems = budget_violations(stats, budget, self.repeat_threshold)
+        if not problems:
+            return
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        message = f"Query budget exceeded for {scope['method']} {route}: " + "; ".join(problems)
+        if self.raise_on_violation:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
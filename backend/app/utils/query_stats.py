@@ -0,0 +1,103 @@
+"""
+Per-request SQL statement accounting.
+
+Cursor execute events on the engines add to every QueryStats open in the
+current context, so a request (or a test) can see how many statements it
+issued, how long they spent in the database and, when asked, which
+statement shapes repeated.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # Parameterised SQL text -> executions; only kept when requested
+    statements: Optional[Counter] = None
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least threshold times (likely N+1)."""
+        if not self.statements:
+            return []
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or block issues more SQL than it is allowed."""
+
+
+# Nested trackers (metrics, budgets, tests) all see the same statements
+_active_stats: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Collect statements executed in this context (and tasks it spawns)."""
+    stats = QueryStats(statements=Counter() if record_statements else None)
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def budget_violations(
+    stats: QueryStats,
+    max_queries: Optional[int],
+    repeat_threshold: Optional[int] = None
+) -> list[str]:
+    """Human-readable reasons stats break the budget; empty when within it."""
+    problems = []
+    if max_queries is not None and stats.count > max_queries:
+        problems.append(f"{stats.count} queries (budget {max_queries})")
+    if repeat_threshold:
+        for sql, n in stats.repeated(repeat_threshold):
+            shape = " ".join(sql.split())
+            problems.append(f"{n}x repeated: {shape[:200]}")
+    return problems
+
+
+@contextmanager
+def assert_max_queries(
+    max_queries: int,
+    repeat_threshold: Optional[int] = None
+) -> Iterator[QueryStats]:
+    """Fail with QueryBudgetExceeded if the block exceeds the query budget."""
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    problems = budget_violations(stats, max_queries, repeat_threshold)
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _active_stats.get()
+    if not active:
+        return
+    elapsed = time.perf_counter() - context._query_started_at
+    for stats in active:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements[statement] += 1
+
+
+def instrument_engine(engine: Union[AsyncEngine, Engine]) -> None:
+    """Attach statement accounting to an engine; safe to call once per engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
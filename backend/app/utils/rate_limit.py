@@ -0,0 +1,194 @@
+"""
+Token-bucket rate limiting for public endpoints.
+
+Routes declare their limits with ``@rate_limit(...)``. Each ``RateLimit``
+is a bucket of ``capacity`` requests that refills over ``per_seconds`` and
+is keyed by the client IP or by a path parameter such as the guest token,
+so one limit can be shared by every route that names it. RateLimitMiddleware
+checks the buckets before the request reaches the endpoint, which keeps
+token guessing and chat spam away from the database and the LLM. Limits
+that need a value only known inside the endpoint (the guest's wedding) are
+checked there with ``enforce_rate_limit``.
+
+Buckets live in process memory, which is per worker; set
+RATE_LIMIT_REDIS_URL to share them across workers and hosts (requires the
+``redis`` package). If Redis is unreachable requests are let through.
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.exceptions import RateLimitException, create_error_response
+from app.utils.routing import match_route
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``capacity`` requests per ``per_seconds``, bursting up to ``capacity``."""
+
+    name: str
+    capacity: int
+    per_seconds: float
+    # "ip", or the path parameter whose value identifies the bucket
+    key: str = "ip"
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+def rate_limit(*limits: RateLimit) -> Callable[[F], F]:
+    """Apply these limits to a route; all of them must have room."""
+    def decorator(func: F) -> F:
+        func.__rate_limits__ = limits
+        return func
+    return decorator
+
+
+class MemoryBackend:
+    """Per-process buckets; the least recently used are dropped past max_keys."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Take one token; returns 0 on success, else seconds until one is free."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / refill_rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def close(self) -> None:
+        self._buckets.clear()
+
+
+# Refill and take atomically on the server, using the server's clock
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Buckets shared by every worker through Redis."""
+
+    def __init__(self, url: str):
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        try:
+            wait = await self._take(keys=[f"ratelimit:{key}"], args=[capacity, refill_rate])
+        except Exception as exc:
+            logger.warning("Rate limit backend unavailable, allowing request: %s", exc)
+            return 0.0
+        return float(wait)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+_backend: Optional[Any] = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if settings.RATE_LIMIT_REDIS_URL:
+            _backend = RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+        else:
+            _backend = MemoryBackend()
+    return _backend
+
+
+async def close_rate_limiter() -> None:
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+async def _check(limit: RateLimit, value: Any) -> float:
+    return await get_backend().take(f"{limit.name}:{value}", limit.capacity, limit.refill_rate)
+
+
+async def enforce_rate_limit(limit: RateLimit, value: Any) -> None:
+    """Take a token from ``limit``'s bucket for ``value`` or raise RateLimitException."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    wait = await _check(limit, value)
+    if wait:
+        raise RateLimitException(retry_after=math.ceil(wait))
+
+
+class RateLimitMiddleware:
+    """Reject requests to @rate_limit routes whose buckets are empty with 429."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route = match_route(scope)
+        limits = getattr(route.get("endpoint"), "__rate_limits__", ())
+        for limit in limits:
+            if limit.key == "ip":
+                value = scope["client"][0] if scope.get("client") else "unknown"
+            else:
+                value = route.get("path_params", {}).get(limit.key)
+                if value is None:
+                    continue
+            wait = await _check(limit, value)
+            if wait:
+                response = JSONResponse(
+                    status_code=429,
+                    content=create_error_response(
+                        detail="Rate limit exceeded. Please try again later.",
+                        error_code="RATE_LIMIT_EXCEEDED"
+                    ),
+                    headers={"Retry-After": str(math.ceil(wait))}
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
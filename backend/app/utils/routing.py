@@ -0,0 +1,19 @@
+"""
+Route lookup for pure ASGI middleware.
+
+Middleware runs before the router, so ``scope["endpoint"]`` and
+``scope["path_params"]`` are not set yet. ``match_route`` does the same
+matching the router will do and returns the child scope of the matching
+route, or an empty dict.
+"""
+from starlette.routing import Match
+from starlette.types import Scope
+
+
+def match_route(scope: Scope) -> Scope:
+    router = getattr(scope.get("app"), "router", None)
+    for route in getattr(router, "routes", ()):
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return child_scope
+    return {}
@@ -0,0 +1,302 @@
+"""
+Lightweight request tracing and event-loop lag monitoring.
+
+Each request gets a trace; ``span()`` blocks (LLM calls, file writes,
+serialization) and every SQL statement become spans inside it. A finished
+trace is exported when it is sampled (TRACE_SAMPLE_RATE) or took at least
+TRACE_SLOW_REQUEST_MS, either as one JSON log line or, when
+TRACE_OTLP_ENDPOINT is set, to an OTLP/HTTP (JSON) collector.
+
+LoopLagMonitor watches the event loop from a separate thread and logs a
+stack sample of whatever is blocking it for longer than
+LOOP_LAG_THRESHOLD_MS.
+"""
+import asyncio
+import json
+import logging
+import queue
+import random
+import secrets
+import sys
+import threading
+import time
+import traceback
+import urllib.request
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("app.tracing")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def _start_span(trace: Trace, name: str, attributes: dict) -> Span:
+    parent = _current_span.get()
+    return Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a span in the current trace; a no-op outside a traced request."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    current = _start_span(trace, name, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+# ── SQL spans ─────────────────────────────────────────────────────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    if trace is not None:
+        context._trace_span = _start_span(trace, "db.query", {"db.statement": statement[:500]})
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = getattr(context, "_trace_span", None)
+    trace = _current_trace.get()
+    if current is not None and trace is not None:
+        current.end_ns = time.time_ns()
+        trace.spans.append(current)
+
+
+def instrument_engine_tracing(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ── Exporters ─────────────────────────────────────────────────────────
+
+def _log_exporter(trace: Trace) -> None:
+    logger.info(json.dumps({
+        "trace_id": trace.trace_id,
+        "spans": [
+            {
+                "name": s.name,
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "start_ns": s.start_ns,
+                "duration_ms": round(s.duration_ms, 3),
+                "attributes": s.attributes,
+            }
+            for s in trace.spans
+        ],
+    }, default=str))
+
+
+class OTLPExporter:
+    """Posts traces to an OTLP/HTTP collector from a background thread."""
+
+    def __init__(self, endpoint: str, max_queue: int = 1000):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def __call__(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            pass  # drop rather than slow requests down
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Flush queued traces and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            if trace is None:
+                return
+            try:
+                request = urllib.request.Request(
+                    self.url,
+                    data=json.dumps(self._payload(trace), default=str).encode(),
+                    headers={"Content-Type": "application/json"},
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.warning(f"Trace export failed: {e}")
+
+    @staticmethod
+    def _payload(trace: Trace) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.APP_NAME}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "app.tracing"},
+                "spans": [
+                    {
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        "parentSpanId": s.parent_id or "",
+                        "name": s.name,
+                        "kind": 2 if s.parent_id is None else 1,
+                        "startTimeUnixNano": str(s.start_ns),
+                        "endTimeUnixNano": str(s.end_ns),
+                        "attributes": [
+                            {"key": k, "value": {"stringValue": str(v)}}
+                            for k, v in s.attributes.items()
+                        ],
+                    }
+                    for s in trace.spans
+                ],
+            }],
+        }]}
+
+
+_exporter = OTLPExporter(settings.TRACE_OTLP_ENDPOINT) if (
+    settings.TRACING_ENABLED and settings.TRACE_OTLP_ENDPOINT
+) else _log_exporter
+
+
+def shutdown_tracing() -> None:
+    if isinstance(_exporter, OTLPExporter):
+        _exporter.shutdown()
+
+
+# ── Middleware ────────────────────────────────────────────────────────
+
+class TracingMiddleware:
+    """Opens a trace per request and exports it when sampled or slow."""
+
+    def __init__(self, app: ASGIApp, sample_rate: float, slow_request_ms: int):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+            await send(message)
+
+        trace = Trace(trace_id=secrets.token_hex(16))
+        token = _current_trace.set(trace)
+        try:
+            with span("http.request", **{"http.method": scope["method"]}) as root:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            root.name = f"{scope['method']} {route}"
+            if root.duration_ms >= self.slow_request_ms or random.random() < self.sample_rate:
+                _exporter(trace)
+
+
+# ── Event-loop lag ────────────────────────────────────────────────────
+
+class LoopLagMonitor:
+    """
+    Detects event-loop stalls. A coroutine stamps a heartbeat every
+    interval; a watchdog thread notices when the stamp goes stale and logs
+    the loop thread's current stack, i.e. the code that is blocking.
+    """
+
+    def __init__(self, threshold_ms: int, interval_ms: int = 50):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+        if self._watchdog:
+            self._watchdog.join(self.interval * 4)
+
+    async def _beat(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        stall_started: Optional[float] = None
+        samples: Counter = Counter()  # distinct stacks seen during this stall
+        while not self._stop.wait(self.interval):
+            lag = time.monotonic() - self._heartbeat - self.interval
+            if lag >= self.threshold:
+                if stall_started is None:
+                    stall_started = self._heartbeat
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    samples["".join(traceback.format_stack(frame, limit=15))] += 1
+            elif stall_started is not None:
+                blocked_ms = (time.monotonic() - stall_started) * 1000
+                logger.warning(json.dumps({
+                    "event": "event_loop_blocked",
+                    "blocked_ms": round(blocked_ms),
+                    "stack_samples": [
+                        {"count": n, "stack": stack} for stack, n in samples.most_common(3)
+                    ],
+                }))
+                stall_started = None
+                samples.clear()
@@ -0,0 +1,60 @@
+"""
+Single-statement upserts for one-row-per-key tables.
+
+``upsert_row`` and ``upsert_rows`` issue ``INSERT ... ON CONFLICT (<key>)
+DO UPDATE ... RETURNING *`` and hand back the stored rows as ORM
+instances, so saving a guest's travel, hotel, food or dress preferences is
+one round trip and double submits cannot create duplicates. The key columns must be backed by
+a unique constraint.
+"""
+from typing import Any, Sequence, TypeVar
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.base import Base
+
+M = TypeVar("M", bound=Base)
+
+
+async def upsert_rows(
+    db: AsyncSession,
+    model: type[M],
+    rows: Sequence[dict[str, Any]],
+    conflict_columns: Sequence[str]
+) -> list[M]:
+    """
+    Insert rows, or overwrite the non-key columns of existing ones, in a
+    single statement. Rows must share the same keys and must not repeat a
+    conflict key.
+    """
+    if not rows:
+        return []
+    stmt = insert(model).values(list(rows))
+
+    changes = {
+        name: stmt.excluded[name] for name in rows[0] if name not in conflict_columns
+    }
+    # ON CONFLICT DO UPDATE does not fire Python-side onupdate defaults
+    for column in model.__table__.columns:
+        if column.onupdate is not None and column.onupdate.is_callable and column.name not in changes:
+            changes[column.name] = column.onupdate.arg(None)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_=changes
+    ).returning(model)
+
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    return list(result.scalars().all())
+
+
+async def upsert_row(
+    db: AsyncSession,
+    model: type[M],
+    values: dict[str, Any],
+    conflict_columns: Sequence[str]
+) -> M:
+    """Insert values, or overwrite the non-key columns of the existing row."""
+    rows = await upsert_rows(db, model, [values], conflict_columns)
+    return rows[0]
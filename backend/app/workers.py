@@ -0,0 +1,13 @@
+"""
+Gunicorn worker class for the production launcher (see gunicorn.conf.py).
+"""
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools instead of "auto"."""
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+    }
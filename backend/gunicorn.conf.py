@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every value can be overridden through the environment. Each worker is a
+separate process with its own event loop and database pool; set
+DB_CONNECTION_BUDGET to the connections this deployment may open in total
+and the pool of each worker is sized from it.
+"""
+import multiprocessing
+import os
+import shutil
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count())
+worker_class = "app.workers.ProductionWorker"
+
+# Workers read this to split DB_CONNECTION_BUDGET between them
+os.environ["WEB_CONCURRENCY"] = str(workers)
+# Workers share metrics through files here so any of them can serve /metrics
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-metrics")
+
+backlog = _env_int("BACKLOG", 2048)
+keepalive = _env_int("KEEP_ALIVE", 5)
+timeout = _env_int("WORKER_TIMEOUT", 60)
+# Time a worker gets on SIGTERM to finish requests and run lifespan shutdown
+graceful_timeout = _env_int("GRACEFUL_TIMEOUT", 30)
+max_requests = _env_int("MAX_REQUESTS", 0)
+max_requests_jitter = _env_int("MAX_REQUESTS_JITTER", 0)
+
+# Only these proxies may set the client address via X-Forwarded-For; rate
+# limits key on it, so never "*" when clients can reach the app directly
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = os.getenv("ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # Multiprocess metrics files from a previous run would be merged in
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
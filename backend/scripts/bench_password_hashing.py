@@ -0,0 +1,77 @@
+"""
+Measure event-loop latency while concurrent admin logins verify passwords.
+
+Usage (from the backend directory; no database required):
+
+    python -m scripts.bench_password_hashing [--logins 20]
+
+A ticker coroutine sleeps in short intervals and records how late it wakes
+up. Verifying bcrypt inline blocks the loop for the whole hash, so the lag
+grows with every login; the executor path should keep it near zero.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from os.path import dirname, abspath
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from app.utils.auth import (  # noqa: E402
+    hash_password, verify_password, verify_password_async
+)
+
+TICK_SECONDS = 0.005
+
+
+async def ticker(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def inline_login(password: str, hashed: str) -> bool:
+    # What the handlers used to do: bcrypt on the event loop thread
+    return verify_password(password, hashed)
+
+
+async def run(mode: str, logins: int, hashed: str) -> dict:
+    verify = verify_password_async if mode == "executor" else inline_login
+    lags: list = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(stop, lags))
+    await asyncio.sleep(TICK_SECONDS * 2)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify("benchmark", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await tick_task
+    assert all(results)
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+async def main(logins: int) -> None:
+    hashed = hash_password("benchmark")
+    for mode in ("inline", "executor"):
+        r = await run(mode, logins, hashed)
+        print(f"{r['mode']:>8}: {logins} logins in {r['elapsed_s']:.2f}s, "
+              f"loop lag p50={r['lag_p50_ms']:.1f}ms "
+              f"p99={r['lag_p99_ms']:.1f}ms max={r['lag_max_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20, help="concurrent logins per run")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
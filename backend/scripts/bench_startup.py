@@ -0,0 +1,102 @@
+"""
+Measure the cost of importing the application and fail on regressions.
+
+Usage (from the backend directory; no database required):
+
+    python -m scripts.bench_startup [--runs 5] [--update-baseline]
+
+Each run imports app.main in a fresh interpreter under ``python -X importtime``
+and records the total import time and the peak RSS of that process. The
+medians are compared against scripts/startup_baseline.json; the script exits
+non-zero if either grows past the allowed tolerance, or if one of the heavy
+optional dependencies (pandas, openpyxl, groq, ...) is imported eagerly
+again. Suitable as a CI step.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from os.path import dirname, abspath, join
+
+BACKEND_DIR = dirname(dirname(abspath(__file__)))
+BASELINE_PATH = join(BACKEND_DIR, "scripts", "startup_baseline.json")
+
+# Only needed by a few admin or chat endpoints; must load on first use
+LAZY_MODULES = ("pandas", "openpyxl", "groq", "PIL", "magic")
+
+PROBE = """
+import json, resource, sys
+import app.main
+print(json.dumps({
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "eager": [m for m in %r if m in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*app\.main$")
+
+
+def measure_once() -> dict:
+    env = dict(os.environ, GROQ_API_KEY=os.environ.get("GROQ_API_KEY", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    import_us = next(
+        int(m.group(1))
+        for m in map(IMPORTTIME_LINE.match, proc.stderr.splitlines()) if m
+    )
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "import_ms": import_us / 1000,
+        "max_rss_mb": probe["max_rss_kb"] / 1024,
+        "eager": probe["eager"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to sample")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth over the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the measured medians as the new baseline")
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    result = {
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "max_rss_mb": round(statistics.median(s["max_rss_mb"] for s in samples), 1),
+    }
+    eager = sorted({m for s in samples for m in s["eager"]})
+    print(f"import app.main: {result['import_ms']}ms, peak RSS {result['max_rss_mb']}MB "
+          f"(median of {args.runs})")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    failures = []
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    for key, value in result.items():
+        limit = baseline[key] * (1 + args.tolerance)
+        if value > limit:
+            failures.append(f"{key} {value} exceeds baseline {baseline[key]} (+{args.tolerance:.0%})")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
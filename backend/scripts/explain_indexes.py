@@ -0,0 +1,267 @@
+"""
+Run EXPLAIN on the hot queries against a seeded database and assert that
+each one is served by the expected index.
+
+Usage (from the backend directory, DATABASE_URL pointing at a migrated DB):
+
+    python -m scripts.explain_indexes [--guests 2000]
+
+Seed data is inserted inside a transaction that is rolled back at the end,
+so the script is safe to run against a development database.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+import uuid
+from datetime import datetime, timedelta
+from os.path import dirname, abspath
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from sqlalchemy import select, func  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Wedding, Guest, RSVPStatus, TravelInfo, DressCode, GuestDressPreference,
+    Activity, GuestActivity, MediaUpload, FileType, Event, Invitation
+)
+
+
+async def seed(conn: AsyncConnection, guest_count: int) -> dict:
+    """Insert one synthetic wedding with guest_count guests and related rows."""
+    now = datetime.utcnow()
+    wedding_id = uuid.uuid4()
+    await conn.execute(Wedding.__table__.insert().values(
+        id=wedding_id,
+        couple_names="Explain & Check",
+        wedding_date=now + timedelta(days=90),
+        admin_email=f"explain-{wedding_id}@example.com",
+        admin_password_hash="x",
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    ))
+
+    statuses = list(RSVPStatus)
+    guests = [
+        {
+            "id": uuid.uuid4(),
+            "wedding_id": wedding_id,
+            "unique_token": secrets.token_urlsafe(32),
+            "full_name": f"Guest {i}",
+            "rsvp_status": statuses[i % len(statuses)],
+            "number_of_attendees": 1 + i % 3,
+            "last_accessed_at": now - timedelta(minutes=i) if i % 2 else None,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        }
+        for i in range(guest_count)
+    ]
+    await conn.execute(Guest.__table__.insert(), guests)
+
+    activities = [
+        {
+            "id": uuid.uuid4(),
+            "wedding_id": wedding_id,
+            "activity_name": f"Activity {i}",
+            "display_order": i,
+            "date_time": now + timedelta(days=i),
+        }
+        for i in range(10)
+    ]
+    await conn.execute(Activity.__table__.insert(), activities)
+
+    dress_code_id = uuid.uuid4()
+    await conn.execute(DressCode.__table__.insert().values(
+        id=dress_code_id, wedding_id=wedding_id, event_name="Henna", display_order=0
+    ))
+
+    event_id = uuid.uuid4()
+    await conn.execute(Event.__table__.insert().values(
+        id=event_id, name="Reception", event_type="reception",
+        start_datetime=now + timedelta(days=90), created_at=now, updated_at=now
+    ))
+
+    await conn.execute(GuestActivity.__table__.insert(), [
+        {
+            "id": uuid.uuid4(),
+            "guest_id": g["id"],
+            "activity_id": activities[i % len(activities)]["id"],
+            "number_of_participants": g["number_of_attendees"],
+            "registered_at": now,
+        }
+        for i, g in enumerate(guests)
+    ])
+    await conn.execute(TravelInfo.__table__.insert(), [
+        {"id": uuid.uuid4(), "guest_id": g["id"], "updated_at": now}
+        for g in guests[::2]
+    ])
+    await conn.execute(GuestDressPreference.__table__.insert(), [
+        {"id": uuid.uuid4(), "guest_id": g["id"], "dress_code_id": dress_code_id}
+        for g in guests[::3]
+    ])
+    await conn.execute(MediaUpload.__table__.insert(), [
+        {
+            "id": uuid.uuid4(),
+            "wedding_id": wedding_id,
+            "guest_id": g["id"],
+            "file_type": FileType.image,
+            "file_name": "photo.jpg",
+            "is_approved": i % 2 == 0,
+            "uploaded_at": now - timedelta(seconds=i),
+        }
+        for i, g in enumerate(guests)
+    ])
+    await conn.execute(Invitation.__table__.insert(), [
+        {
+            "id": uuid.uuid4(),
+            "guest_id": g["id"],
+            "event_id": event_id,
+            "invitation_code": secrets.token_hex(8).upper(),
+            "is_sent": i % 2 == 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i, g in enumerate(guests)
+    ])
+
+    return {
+        "wedding_id": wedding_id,
+        "guest_id": guests[0]["id"],
+        "token": guests[0]["unique_token"],
+        "activity_id": activities[0]["id"],
+        "dress_code_id": dress_code_id,
+        "event_id": event_id,
+    }
+
+
+def key_queries(ids: dict) -> list:
+    """(description, query, accepted index names) for the hot query shapes."""
+    w, g = ids["wedding_id"], ids["guest_id"]
+    return [
+        (
+            "admin guest list page",
+            select(Guest).where(Guest.wedding_id == w)
+            .order_by(Guest.created_at.desc(), Guest.id.desc()).limit(21),
+            {"ix_guests_wedding_id_created_at_id"},
+        ),
+        (
+            "dashboard RSVP count",
+            select(func.count(Guest.id)).where(
+                Guest.wedding_id == w, Guest.rsvp_status == RSVPStatus.confirmed
+            ),
+            {"ix_guests_wedding_id_rsvp_status"},
+        ),
+        (
+            "guest token lookup",
+            select(Guest).where(Guest.unique_token == ids["token"]),
+            {"ix_unique_token", "ix_guests_unique_token"},
+        ),
+        (
+            "activity participant sum",
+            select(func.sum(GuestActivity.number_of_participants))
+            .where(GuestActivity.activity_id == ids["activity_id"]),
+            {"ix_guest_activities_activity_id"},
+        ),
+        (
+            "guest activity registrations",
+            select(GuestActivity).where(GuestActivity.guest_id == g),
+            {"uq_guest_activity"},
+        ),
+        (
+            "guest travel info",
+            select(TravelInfo).where(TravelInfo.guest_id == g),
+            {"uq_travel_infos_guest_id"},
+        ),
+        (
+            "guest dress preference",
+            select(GuestDressPreference).where(
+                GuestDressPreference.guest_id == g,
+                GuestDressPreference.dress_code_id == ids["dress_code_id"]
+            ),
+            {"uq_guest_dress_code"},
+        ),
+        (
+            "activities list",
+            select(Activity).where(Activity.wedding_id == w)
+            .order_by(Activity.display_order, Activity.date_time),
+            {"ix_activities_wedding_id_display_order"},
+        ),
+        (
+            "media approval count",
+            select(func.count(MediaUpload.id)).where(
+                MediaUpload.wedding_id == w, MediaUpload.is_approved == False
+            ),
+            {"ix_media_uploads_wedding_id_is_approved_uploaded_at"},
+        ),
+        (
+            "admin media gallery page",
+            select(MediaUpload).where(MediaUpload.wedding_id == w)
+            .order_by(MediaUpload.uploaded_at.desc(), MediaUpload.id.desc()).limit(21),
+            {"ix_media_uploads_wedding_id_uploaded_at_id"},
+        ),
+        (
+            "guest own media",
+            select(MediaUpload).where(MediaUpload.guest_id == g)
+            .order_by(MediaUpload.uploaded_at.desc()),
+            {"ix_media_uploads_guest_id_uploaded_at"},
+        ),
+        (
+            "event sent invitations",
+            select(func.count(Invitation.id)).where(
+                Invitation.event_id == ids["event_id"], Invitation.is_sent == True
+            ),
+            {"ix_invitations_event_id_is_sent"},
+        ),
+    ]
+
+
+def index_names(plan: dict) -> set:
+    """Collect every index referenced anywhere in an EXPLAIN JSON plan."""
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+async def main(guest_count: int) -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            ids = await seed(conn, guest_count)
+            await conn.exec_driver_sql("ANALYZE")
+            # Small seeded tables make sequential scans look cheap; disabling
+            # them checks that a usable index exists for each query shape.
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+            for description, query, expected in key_queries(ids):
+                sql = query.compile(
+                    dialect=conn.dialect,
+                    compile_kwargs={"literal_binds": True}
+                )
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                used = index_names(plan[0]["Plan"])
+                ok = bool(used & expected)
+                failures += not ok
+                print(f"[{'OK' if ok else 'FAIL'}] {description}: "
+                      f"uses {sorted(used) or 'no index'}, expected one of {sorted(expected)}")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--guests", type=int, default=2000, help="number of seeded guests")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.guests)))
@@ -0,0 +1,366 @@
+"""
+Seed synthetic weddings and replay a traffic mix against the app in-process.
+
+Usage (from the backend directory, DATABASE_URL pointing at a migrated,
+disposable database):
+
+    python -m scripts.loadtest --mix invite_blast --requests 2000 --concurrency 50
+    python -m scripts.loadtest --mix mixed --compare loadtest_results/mixed-<ts>.json
+
+Requests go through httpx's ASGI transport, so no server is needed and the
+numbers cover the app and database only. The Groq client is replaced by a
+fake with a fixed latency, and rate limiting is switched off. Each run
+prints p50/p95/p99 latency, throughput and SQL statements per request per
+scenario, and writes them to loadtest_results/ for later comparison.
+--compare exits non-zero when a scenario's p95 regresses by more than
+--max-regression. Seeded weddings are deleted afterwards unless --keep is
+given.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import secrets
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from os.path import dirname, abspath, join
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+# All in-process traffic comes from one address and a few tokens, so rate
+# limits would turn the benchmark into a measurement of 429s
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, or_, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Wedding, Guest, RSVPStatus, Activity, ActivityWaitlist, GuestActivity, MediaUpload, FileType
+)
+from app.models.chatbot_log import ChatbotLog  # noqa: E402
+from app.services import groq_client  # noqa: E402
+from app.utils.auth import create_access_token  # noqa: E402
+from app.utils.query_stats import track_queries  # noqa: E402
+
+BACKEND_DIR = dirname(dirname(abspath(__file__)))
+RESULTS_DIR = join(BACKEND_DIR, "loadtest_results")
+EMAIL_DOMAIN = "loadtest.example.com"
+
+MIXES = {
+    "invite_blast": {"portal_open": 0.75, "rsvp_submit": 0.2, "chatbot_message": 0.05},
+    "admin_polling": {"dashboard_poll": 0.6, "portal_open": 0.4},
+    "chatbot_burst": {"chatbot_message": 0.8, "portal_open": 0.2},
+    "mixed": {
+        "portal_open": 0.5, "rsvp_submit": 0.15,
+        "dashboard_poll": 0.15, "chatbot_message": 0.2,
+    },
+}
+
+
+# ── Seeding ───────────────────────────────────────────────────────────
+
+async def seed_wedding(conn: AsyncConnection, index: int, args) -> dict:
+    """Insert one wedding with its guests, activities, media and chat logs."""
+    now = datetime.utcnow()
+    wedding_id = uuid.uuid4()
+    await conn.execute(Wedding.__table__.insert().values(
+        id=wedding_id,
+        couple_names=f"Load Test {index}",
+        wedding_date=now + timedelta(days=90),
+        admin_email=f"{wedding_id}@{EMAIL_DOMAIN}",
+        admin_password_hash="x",
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    ))
+
+    guests = [
+        {
+            "id": uuid.uuid4(),
+            "wedding_id": wedding_id,
+            "unique_token": secrets.token_urlsafe(32),
+            "full_name": f"Guest {index}-{i}",
+            "rsvp_status": RSVPStatus.pending,
+            "number_of_attendees": 1,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        }
+        for i in range(args.guests)
+    ]
+    await conn.execute(Guest.__table__.insert(), guests)
+
+    activities = [
+        {
+            "id": uuid.uuid4(),
+            "wedding_id": wedding_id,
+            "activity_name": f"Activity {i}",
+            "display_order": i,
+            "date_time": now + timedelta(days=89, hours=i),
+            "max_participants": args.guests * 2,
+        }
+        for i in range(args.activities)
+    ]
+    if activities:
+        await conn.execute(Activity.__table__.insert(), activities)
+
+    if args.media:
+        await conn.execute(MediaUpload.__table__.insert(), [
+            {
+                "id": uuid.uuid4(),
+                "wedding_id": wedding_id,
+                "guest_id": random.choice(guests)["id"],
+                "file_type": FileType.image,
+                "file_name": "photo.jpg",
+                "file_url": "/uploads/loadtest/photo.jpg",
+                "file_size": 250_000,
+                "is_approved": i % 3 != 0,
+                "uploaded_at": now - timedelta(minutes=i),
+            }
+            for i in range(args.media)
+        ])
+
+    if args.chat_logs:
+        await conn.execute(ChatbotLog.__table__.insert(), [
+            {
+                "id": uuid.uuid4(),
+                "wedding_id": wedding_id,
+                "guest_id": random.choice(guests)["id"],
+                "session_id": f"seed-{i % 50}",
+                "user_message": "What time does the henna night start?",
+                "bot_response": "The henna night starts at 7pm.",
+                "topic_detected": "schedule",
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(args.chat_logs)
+        ])
+
+    return {
+        "wedding_id": wedding_id,
+        "admin_token": create_access_token(wedding_id),
+        "guest_tokens": [g["unique_token"] for g in guests],
+        "activity_ids": [str(a["id"]) for a in activities],
+    }
+
+
+async def seed(args) -> list[dict]:
+    async with engine.begin() as conn:
+        return [await seed_wedding(conn, i, args) for i in range(args.weddings)]
+
+
+async def cleanup(wedding_ids: list) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(delete(ChatbotLog).where(ChatbotLog.wedding_id.in_(wedding_ids)))
+        await conn.execute(delete(MediaUpload).where(MediaUpload.wedding_id.in_(wedding_ids)))
+        # The migrated schema has no ON DELETE CASCADE from guest_activities
+        guest_ids = select(Guest.id).where(Guest.wedding_id.in_(wedding_ids))
+        activity_ids = select(Activity.id).where(Activity.wedding_id.in_(wedding_ids))
+        for model in (GuestActivity, ActivityWaitlist):
+            await conn.execute(delete(model).where(or_(
+                model.guest_id.in_(guest_ids), model.activity_id.in_(activity_ids)
+            )))
+        await conn.execute(delete(Guest).where(Guest.wedding_id.in_(wedding_ids)))
+        await conn.execute(delete(Activity).where(Activity.wedding_id.in_(wedding_ids)))
+        await conn.execute(delete(Wedding).where(Wedding.id.in_(wedding_ids)))
+
+
+# ── Fake LLM ──────────────────────────────────────────────────────────
+
+class FakeGroq:
+    """Stands in for the Groq client; sleeps like a real completion would."""
+
+    def __init__(self, latency: float):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.latency = latency
+
+    def _create(self, **kwargs):
+        # Called from a worker thread, like the real client
+        time.sleep(self.latency)
+        message = SimpleNamespace(content="Happy to help! The celebration starts at 7pm.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+# ── Scenarios ─────────────────────────────────────────────────────────
+
+async def portal_open(client: httpx.AsyncClient, wedding: dict) -> httpx.Response:
+    token = random.choice(wedding["guest_tokens"])
+    return await client.get(f"/api/guest/{token}")
+
+
+async def rsvp_submit(client: httpx.AsyncClient, wedding: dict) -> httpx.Response:
+    token = random.choice(wedding["guest_tokens"])
+    activity_ids = wedding["activity_ids"]
+    return await client.put(f"/api/guest/{token}/rsvp", json={
+        "rsvp_status": random.choice(["confirmed", "confirmed", "declined"]),
+        "number_of_attendees": random.randint(1, 3),
+        "activity_ids": random.sample(activity_ids, k=min(len(activity_ids), 3)),
+    })
+
+
+async def dashboard_poll(client: httpx.AsyncClient, wedding: dict) -> httpx.Response:
+    return await client.get(
+        "/api/admin/wedding/dashboard-stats",
+        headers={"Authorization": f"Bearer {wedding['admin_token']}"}
+    )
+
+
+async def chatbot_message(client: httpx.AsyncClient, wedding: dict) -> httpx.Response:
+    token = random.choice(wedding["guest_tokens"])
+    return await client.post(f"/api/chatbot/chat/{token}", json={
+        "message": "What time does the henna night start?",
+        "session_id": f"loadtest-{random.randint(0, 999)}",
+        "language": "en",
+    })
+
+
+SCENARIOS = {
+    "portal_open": portal_open,
+    "rsvp_submit": rsvp_submit,
+    "dashboard_poll": dashboard_poll,
+    "chatbot_message": chatbot_message,
+}
+
+
+# ── Runner ────────────────────────────────────────────────────────────
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def replay(weddings: list[dict], args) -> dict:
+    mix = MIXES[args.mix]
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}
+    remaining = args.requests
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            name = random.choices(names, weights)[0]
+            started = time.perf_counter()
+            with track_queries() as stats:
+                response = await SCENARIOS[name](client, random.choice(weddings))
+            samples[name].append({
+                "ms": (time.perf_counter() - started) * 1000,
+                "ok": response.status_code < 400,
+                "queries": stats.count,
+            })
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    scenarios = {}
+    for name, runs in samples.items():
+        if not runs:
+            continue
+        latencies = [r["ms"] for r in runs]
+        scenarios[name] = {
+            "requests": len(runs),
+            "errors": sum(not r["ok"] for r in runs),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries_per_request": round(statistics.mean(r["queries"] for r in runs), 2),
+        }
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "scenarios": scenarios,
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"\n{result['mix']}: {result['requests']} requests, concurrency "
+          f"{result['concurrency']}, {result['throughput_rps']} req/s")
+    print(f"{'scenario':<18}{'reqs':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'queries':>9}")
+    for name, s in result["scenarios"].items():
+        print(f"{name:<18}{s['requests']:>7}{s['errors']:>8}{s['p50_ms']:>10}"
+              f"{s['p95_ms']:>10}{s['p99_ms']:>10}{s['queries_per_request']:>9}")
+
+
+def compare(result: dict, baseline_path: str, max_regression: float) -> int:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    failures = 0
+    print(f"\nCompared with {baseline_path}:")
+    for name, s in result["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if not base:
+            continue
+        change = (s["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        regressed = change > max_regression
+        failures += regressed
+        print(f"[{'FAIL' if regressed else 'OK'}] {name}: p95 {base['p95_ms']} -> {s['p95_ms']} ms "
+              f"({change:+.0%}), queries {base['queries_per_request']} -> {s['queries_per_request']}")
+    return 1 if failures else 0
+
+
+async def main(args) -> int:
+    random.seed(args.seed)
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    groq_client._client = FakeGroq(args.llm_latency)
+
+    print(f"Seeding {args.weddings} wedding(s) x {args.guests} guests ...")
+    weddings = await seed(args)
+    try:
+        result = await replay(weddings, args)
+    finally:
+        if not args.keep:
+            await cleanup([w["wedding_id"] for w in weddings])
+        await engine.dispose()
+
+    result = {
+        "mix": args.mix,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": {k: getattr(args, k) for k in ("weddings", "guests", "activities", "media", "chat_logs")},
+        **result,
+    }
+    print_report(result)
+
+    Path(RESULTS_DIR).mkdir(exist_ok=True)
+    out_path = join(RESULTS_DIR, f"{args.mix}-{result['timestamp'].replace(':', '')}.json")
+    with open(out_path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {out_path}")
+
+    if args.compare:
+        return compare(result, args.compare, args.max_regression)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--weddings", type=int, default=3)
+    parser.add_argument("--guests", type=int, default=300, help="guests per wedding")
+    parser.add_argument("--activities", type=int, default=8, help="activities per wedding")
+    parser.add_argument("--media", type=int, default=200, help="media uploads per wedding")
+    parser.add_argument("--chat-logs", type=int, default=500, help="chat logs per wedding")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="fake LLM seconds per call")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for the traffic mix")
+    parser.add_argument("--compare", help="previous result file to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="allowed relative p95 growth with --compare")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded weddings")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.utils.query_budget import QueryBudgetMiddleware, query_budget
+from app.utils.query_stats import QueryBudgetExceeded, instrument_engine
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def run_queries(engine, n: int, sql: str = "SELECT 1") -> None:
+    with engine.connect() as conn:
+        for _ in range(n):
+            conn.execute(text(sql))
+
+
+def test_within_budget(engine, assert_max_queries):
+    with assert_max_queries(2) as stats:
+        run_queries(engine, 2)
+    assert stats.count == 2
+
+
+def test_over_budget(engine, assert_max_queries):
+    with pytest.raises(QueryBudgetExceeded, match="3 queries"):
+        with assert_max_queries(2):
+            run_queries(engine, 3)
+
+
+def test_repeated_statement_flagged(engine, assert_max_queries):
+    with pytest.raises(QueryBudgetExceeded, match="repeated"):
+        with assert_max_queries(10, repeat_threshold=3):
+            run_queries(engine, 3)
+
+
+def test_route_budget_checked_by_middleware(engine):
+    app = FastAPI()
+    app.add_middleware(
+        QueryBudgetMiddleware, default_budget=None, repeat_threshold=None, raise_on_violation=True
+    )
+
+    @app.get("/cheap")
+    @query_budget(1)
+    async def cheap():
+        run_queries(engine, 1)
+        return {}
+
+    @app.get("/chatty")
+    @query_budget(1)
+    async def chatty():
+        run_queries(engine, 2)
+        return {}
+
+    async def get(path: str) -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    assert asyncio.run(get("/cheap")).status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="budget 1"):
+        asyncio.run(get("/chatty"))
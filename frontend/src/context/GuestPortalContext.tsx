@@ -20,6 +20,7 @@ import type {
   DressCodeWithPreference,
 } from '../types';
 import * as guestPortalApi from '../services/guestPortal.api';
+import { newIdempotencyKey } from '../services/api';
 
 // Portal data structure - matches API response from GET /api/guest/{token}
 export interface PortalData {
@@ -46,6 +47,12 @@ export interface SectionCompletion {
   hotel: boolean;
 }
 
+// Mutation variables: the key is created per submit so retries reuse it
+interface IdempotentSubmit<T> {
+  data: T;
+  idempotencyKey: string;
+}
+
 interface GuestPortalContextType {
   // Data
   token: string | null;
@@ -112,7 +119,7 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
 
   // Update RSVP mutation - calls real API
   const updateRSVPMutation = useMutation({
-    mutationFn: async (data: Partial<Guest> & { number_of_attendees?: number; special_requests?: string; song_requests?: string; notes_to_couple?: string; activity_ids?: string[] }) => {
+    mutationFn: async ({ data, idempotencyKey }: IdempotentSubmit<Partial<Guest> & { number_of_attendees?: number; special_requests?: string; song_requests?: string; notes_to_couple?: string; activity_ids?: string[] }>) => {
       const rsvpData = {
         rsvp_status: data.rsvp_status || 'confirmed',
         phone: data.phone,
@@ -123,11 +130,11 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
         notes_to_couple: data.notes_to_couple,
         activity_ids: data.activity_ids,
       };
-      return await guestPortalApi.updateRSVP(token, rsvpData);
+      return await guestPortalApi.saveSections(token, { rsvp: rsvpData }, idempotencyKey);
     },
-    onSuccess: () => {
-      // Refresh the portal data to get the latest state
-      queryClient.invalidateQueries({ queryKey: ['portalData', token] });
+    onSuccess: (portal) => {
+      // The save returns the latest portal state, so no refetch is needed
+      queryClient.setQueryData(['portalData', token], portal);
       message.success('RSVP updated successfully!');
     },
     onError: () => {
@@ -137,7 +144,7 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
 
   // Update travel info mutation - calls real API
   const updateTravelMutation = useMutation({
-    mutationFn: async (data: Partial<GuestTravelInfo>) => {
+    mutationFn: async ({ data, idempotencyKey }: IdempotentSubmit<Partial<GuestTravelInfo>>) => {
       const travelData = {
         arrival_date: data.arrival_date,
         arrival_time: data.arrival_time,
@@ -150,10 +157,10 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
         needs_dropoff: data.needs_dropoff || false,
         special_requirements: data.special_requirements,
       };
-      return await guestPortalApi.updateTravel(token, travelData);
+      return await guestPortalApi.saveSections(token, { travel: travelData }, idempotencyKey);
     },
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['portalData', token] });
+    onSuccess: (portal) => {
+      queryClient.setQueryData(['portalData', token], portal);
       message.success('Travel information saved!');
     },
     onError: () => {
@@ -163,7 +170,7 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
 
   // Update hotel preference mutation - calls real API
   const updateHotelMutation = useMutation({
-    mutationFn: async (data: Partial<GuestHotelPreference>) => {
+    mutationFn: async ({ data, idempotencyKey }: IdempotentSubmit<Partial<GuestHotelPreference>>) => {
       const hotelData = {
         suggested_hotel_id: data.suggested_hotel_id?.toString(),
         custom_hotel_name: data.custom_hotel_name,
@@ -175,10 +182,10 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
         special_requests: data.special_requests,
         booking_confirmation: data.booking_confirmation,
       };
-      return await guestPortalApi.updateHotel(token, hotelData);
+      return await guestPortalApi.saveSections(token, { hotel: hotelData }, idempotencyKey);
     },
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['portalData', token] });
+    onSuccess: (portal) => {
+      queryClient.setQueryData(['portalData', token], portal);
       message.success('Hotel preference saved!');
     },
     onError: () => {
@@ -190,21 +197,21 @@ export const GuestPortalProvider: React.FC<GuestPortalProviderProps> = ({ childr
   // Handler functions
   const updateRSVP = useCallback(
     async (data: Partial<Guest>) => {
-      await updateRSVPMutation.mutateAsync(data);
+      await updateRSVPMutation.mutateAsync({ data, idempotencyKey: newIdempotencyKey() });
     },
     [updateRSVPMutation]
   );
 
   const updateTravelInfo = useCallback(
     async (data: Partial<GuestTravelInfo>) => {
-      await updateTravelMutation.mutateAsync(data);
+      await updateTravelMutation.mutateAsync({ data, idempotencyKey: newIdempotencyKey() });
     },
     [updateTravelMutation]
   );
 
   const updateHotelPreference = useCallback(
     async (data: Partial<GuestHotelPreference>) => {
-      await updateHotelMutation.mutateAsync(data);
+      await updateHotelMutation.mutateAsync({ data, idempotencyKey: newIdempotencyKey() });
     },
     [updateHotelMutation]
   );
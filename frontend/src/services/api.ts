@@ -147,6 +147,19 @@ api.interceptors.response.use(
 
 export default api;
 
+// Key for the Idempotency-Key header: create one per user submit and reuse it
+// when that submit is retried, so the server replays the first response
+// instead of running the write again
+export const newIdempotencyKey = (): string => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  // randomUUID is only available in secure contexts
+  return Array.from(crypto.getRandomValues(new Uint8Array(16)), (byte) =>
+    byte.toString(16).padStart(2, '0')
+  ).join('');
+};
+
 // Helper to create FormData for file uploads
 export const createFormData = (data: Record<string, unknown>): FormData => {
   const formData = new FormData();
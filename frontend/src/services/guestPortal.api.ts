@@ -1,6 +1,7 @@
-import api from './api';
+import api, { newIdempotencyKey } from './api';
 import {
   GuestPortalData,
+  GuestSectionsUpdate,
   GuestRSVP,
   TravelInfoUpdate,
   HotelInfoUpdate,
@@ -12,16 +13,31 @@ import {
   SuccessResponse,
 } from '../types';
 
+const idempotencyHeaders = (key: string) => ({ 'Idempotency-Key': key });
+
 // Get complete portal data
 export const getPortalData = async (token: string): Promise<GuestPortalData> => {
   const response = await api.get<GuestPortalData>(`/api/guest/${token}`);
   return response.data;
 };
 
+// Save several sections at once; returns the refreshed portal data
+export const saveSections = async (
+  token: string,
+  data: GuestSectionsUpdate,
+  idempotencyKey: string = newIdempotencyKey()
+): Promise<GuestPortalData> => {
+  const response = await api.put<GuestPortalData>(`/api/guest/${token}/sections`, data, {
+    headers: idempotencyHeaders(idempotencyKey),
+  });
+  return response.data;
+};
+
 // Update RSVP (includes activities, song requests, notes to couple)
 export const updateRSVP = async (
   token: string,
-  data: GuestRSVP
+  data: GuestRSVP,
+  idempotencyKey: string = newIdempotencyKey()
 ): Promise<{
   id: string;
   full_name: string;
@@ -34,7 +50,9 @@ export const updateRSVP = async (
   notes_to_couple?: string;
   rsvp_submitted_at?: string;
 }> => {
-  const response = await api.put(`/api/guest/${token}/rsvp`, data);
+  const response = await api.put(`/api/guest/${token}/rsvp`, data, {
+    headers: idempotencyHeaders(idempotencyKey),
+  });
   return response.data;
 };
 
@@ -115,7 +133,8 @@ export const updateFoodPreference = async (
 export const registerActivity = async (
   token: string,
   activityId: string,
-  data: ActivityRegistrationForm
+  data: ActivityRegistrationForm,
+  idempotencyKey: string = newIdempotencyKey()
 ): Promise<{
   id: string;
   activity_id: string;
@@ -126,7 +145,8 @@ export const registerActivity = async (
 }> => {
   const response = await api.post(
     `/api/guest/${token}/activities/${activityId}/register`,
-    data
+    data,
+    { headers: idempotencyHeaders(idempotencyKey) }
   );
   return response.data;
 };
@@ -146,7 +166,8 @@ export const unregisterActivity = async (
 export const uploadMedia = async (
   token: string,
   file: File,
-  data?: { caption?: string; event_tag?: string }
+  data?: { caption?: string; event_tag?: string },
+  idempotencyKey: string = newIdempotencyKey()
 ): Promise<MediaUploadResponse> => {
   const formData = new FormData();
   formData.append('file', file);
@@ -164,6 +185,7 @@ export const uploadMedia = async (
     {
       headers: {
         'Content-Type': 'multipart/form-data',
+        ...idempotencyHeaders(idempotencyKey),
       },
     }
   );
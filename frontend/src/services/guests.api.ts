@@ -13,6 +13,8 @@ interface GuestFilters {
   page?: number;
   page_size?: number;
   per_page?: number;
+  cursor?: string;
+  include_total?: boolean;
   search?: string;
   rsvp_status?: RSVPStatus;
   has_travel_info?: boolean;
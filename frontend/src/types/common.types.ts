@@ -7,6 +7,8 @@ export interface PaginatedResponse<T> {
   total_pages: number;
   has_next: boolean;
   has_previous: boolean;
+  next_cursor?: string | null;
+  total_is_estimate?: boolean;
 }
 
 // API Error interface
@@ -28,6 +30,8 @@ export interface SuccessResponse {
 export interface PaginationParams {
   page?: number;
   page_size?: number;
+  cursor?: string;
+  include_total?: boolean;
   sort_by?: string;
   sort_order?: 'asc' | 'desc';
 }
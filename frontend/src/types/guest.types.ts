@@ -194,10 +194,10 @@ export interface GuestFilters {
 // Guest Portal Data Types (inline to avoid circular imports)
 // ============================================
 
-import { TravelInfo } from './travel.types';
-import { HotelInfo, SuggestedHotel } from './hotel.types';
-import { DressCode, GuestDressPreference } from './dress.types';
-import { FoodMenu, GuestFoodPreference } from './food.types';
+import { TravelInfo, TravelInfoUpdate } from './travel.types';
+import { HotelInfo, HotelInfoUpdate, SuggestedHotel } from './hotel.types';
+import { DressCode, GuestDressPreference, GuestDressPreferenceUpdate } from './dress.types';
+import { FoodMenu, GuestFoodPreference, GuestFoodPreferenceUpdate } from './food.types';
 import { Activity, GuestActivityRegistration } from './activity.types';
 import { MediaUpload } from './media.types';
 import { WeddingPublicInfo } from './wedding.types';
@@ -226,3 +226,12 @@ export interface GuestPortalData {
   activities: ActivityWithRegistration[];
   media_uploads: MediaUpload[];
 }
+
+// Any subset of sections for PUT /{token}/sections, saved in one transaction
+export interface GuestSectionsUpdate {
+  rsvp?: GuestRSVP;
+  travel?: TravelInfoUpdate;
+  hotel?: HotelInfoUpdate;
+  food?: GuestFoodPreferenceUpdate;
+  dress_preferences?: GuestDressPreferenceUpdate[];
+}